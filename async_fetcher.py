@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import queue
+import threading
+import traceback
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import egress
+import http_fetcher
+import rate_control
+
+# Settings.
+
+# Maximum number of requests in flight over all hosts.
+MAX_IN_FLIGHT = 200
+# Maximum number of requests in flight per host.
+PER_HOST = 8
+# Requests started per second per host to begin with. The rate controller of each host
+# raises it while pages come through and lowers it when they are blocked.
+RATE = 4.0
+
+
+# Script.
+
+# A page to fetch for an item. required and accept are passed to http_fetcher.check_page.
+Page = namedtuple("Page", ["url", "required", "accept"], defaults=[(), ()])
+
+
+class HostLimiter:
+    """
+    Caps the number of requests in flight for each host and paces the requests to each
+    host with its own rate_control.RateController. Must only be used from a single event loop.
+
+    concurrency [int] - Requests in flight per host. PER_HOST by default.
+    rate [float] - Requests started per second per host to begin with. RATE by default.
+    """
+
+    def __init__(self, concurrency=PER_HOST, rate=RATE):
+        self.concurrency = concurrency
+        self.rate = rate
+        self._semaphores = {}
+        self._controllers = {}
+
+    def controller(self, host):
+        """Returns the rate controller of host, creating it on first use."""
+        if host not in self._controllers:
+            self._controllers[host] = rate_control.RateController(self.rate, max_rate=max(self.rate, rate_control.MAX_RATE))
+        return self._controllers[host]
+
+    def log_stats(self):
+        """Logs the rate and block rate each host ended at."""
+        for host, controller in self._controllers.items():
+            logging.info(f"Rate control of {host}:")
+            controller.log_stats()
+
+    @asynccontextmanager
+    async def limit(self, host):
+        """Waits until a request to host may start and holds one of its slots."""
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            # Reserve the next start time for host so requests are spaced 1 / rate apart.
+            delay = self.controller(host).delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+
+
+async def fetch(session, limiter, page, cache=None, max_age=None, assignment=None):
+    """Returns the html of page or None if it has to be loaded in a browser.
+
+    session [aiohttp.ClientSession] - Session to fetch with.
+    limiter [HostLimiter] - Per host limits.
+    page [Page] - Page to fetch.
+    cache [page_cache.PageCache] - If given, fresh cached pages are returned without a request
+    and fetched pages are added to it. None by default.
+    max_age [float] - Seconds after which a cached page is stale. None by default.
+    assignment [egress.Assignment] - Sticky proxy of the run. Requests go out directly if None (default)."""
+    if cache is not None:
+        html = cache.get(page.url, max_age)
+        if html is not None:
+            return html
+
+    host = urlsplit(page.url).hostname
+    endpoint = None
+    if assignment is not None:
+        # Waits in a thread if every proxy is cooling down.
+        endpoint = await asyncio.get_running_loop().run_in_executor(None, assignment.get)
+    async with limiter.limit(host):
+        try:
+            async with session.get(page.url, proxy=endpoint and endpoint.url) as response:
+                status = response.status
+                html = await response.text(errors="replace")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.info(f"HTTP fetch of {page.url} failed: {e!r}")
+            http_fetcher.count("escalated_error")
+            if endpoint is not None:
+                endpoint.report(egress.ERROR)
+            return None
+
+    html = http_fetcher.check_page(page.url, status, html, page.required, page.accept, limiter.controller(host), endpoint)
+    if html is not None and cache is not None:
+        cache.put(page.url, html)
+    return html
+
+
+async def _fetch_items(items, pages_of, results, concurrency, rate, max_in_flight, cache, max_age):
+    """Fetches the pages of every item and puts (item, htmls) in results."""
+    loop = asyncio.get_running_loop()
+    limiter = HostLimiter(concurrency, rate)
+    connector = aiohttp.TCPConnector(limit=max_in_flight, limit_per_host=concurrency)
+    timeout = aiohttp.ClientTimeout(total=http_fetcher.TIMEOUT)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    # Goes out through one proxy at a time if egress.PROXIES are set.
+    pool = egress.get_proxy_pool()
+    assignment = egress.Assignment(pool) if pool is not None else None
+
+    async with aiohttp.ClientSession(headers=http_fetcher.HEADERS, connector=connector, timeout=timeout) as session:
+        async def fetch_item(item):
+            try:
+                htmls = await asyncio.gather(*(fetch(session, limiter, page, cache, max_age, assignment) for page in pages_of(item)))
+            except Exception:
+                # Hand the item on with no pages so it is loaded in a browser instead of lost.
+                logging.error(f"Exception in fetch_item\n{traceback.format_exc()}")
+                htmls = [None] * len(pages_of(item))
+            finally:
+                in_flight.release()
+            # Blocks while the consumer is behind so memory stays bounded.
+            await loop.run_in_executor(None, results.put, (item, htmls))
+
+        tasks = set()
+        for item in items:
+            await in_flight.acquire()
+            task = asyncio.create_task(fetch_item(item))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+    limiter.log_stats()
+
+
+def fetch_iter(items, pages_of, concurrency=PER_HOST, rate=RATE, max_in_flight=MAX_IN_FLIGHT, cache=None, max_age=None):
+    """Fetches the pages of every item concurrently in a background event loop and yields
+    (item, htmls) as they complete, where htmls has the html of each page or None if the page
+    has to be loaded in a browser. Results are not in the order of items.
+
+    items [iterable] - Items to fetch pages for, e.g. csv rows or creator ids.
+    pages_of [callable] - Takes an item and returns a list of Page.
+    concurrency [int] - Requests in flight per host. PER_HOST by default.
+    rate [float] - Requests started per second per host to begin with. RATE by default.
+    max_in_flight [int] - Requests in flight over all hosts. MAX_IN_FLIGHT by default.
+    cache [page_cache.PageCache] - Cache to read fresh pages from and add fetched pages to. None by default.
+    max_age [float] - Seconds after which a cached page is stale. Never stale if None (default)."""
+    results = queue.Queue(maxsize=max_in_flight)
+    done = object()
+
+    def run_loop():
+        try:
+            asyncio.run(_fetch_items(items, pages_of, results, concurrency, rate, max_in_flight, cache, max_age))
+        except Exception:
+            logging.error(f"Exception in fetch_iter\n{traceback.format_exc()}")
+        finally:
+            results.put(done)
+
+    thread = threading.Thread(target=run_loop, daemon=True)
+    thread.start()
+    while True:
+        result = results.get()
+        if result is done:
+            break
+        yield result
+    thread.join()
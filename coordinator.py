@@ -0,0 +1,242 @@
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import job_queue
+
+# Settings.
+
+# Address the coordinator listens on. Only this machine can connect by default. Set to "0.0.0.0"
+# to let worker nodes connect, which use http://<coordinator's ip>:PORT as COORDINATOR_URL. Anyone
+# who can reach the port can lease jobs and send results, so only do so on a trusted network.
+HOST = "127.0.0.1"
+PORT = 8765
+# Seconds to wait for the coordinator before a node gives up on a request.
+REQUEST_TIMEOUT = 60
+
+
+# Script.
+
+def create_results_table(cur):
+    """Creates the results table if it doesn't exist. Each row holds the writes a node made
+    for a job, kept until they are merged into the tables of the database.
+
+    cur [sqlite3.Cursor] - Cursor of the canonical database."""
+    cur.execute("""CREATE TABLE IF NOT EXISTS results(
+        queue TEXT,
+        key TEXT,
+        worker TEXT,
+        writes TEXT,
+        merged INTEGER DEFAULT 0,
+        PRIMARY KEY (queue, key, worker)
+        )""")
+
+
+def merge_results(con, queue_name, handlers):
+    """Replays the unmerged writes of queue_name into the database with the same handlers the
+    local database writer uses, so INSERT OR IGNORE, ignored projects and aliases work like in
+    a single machine run. Only keys whose job is done or failed are merged. Results are replayed
+    in key order and a key done by more than one node keeps only the result of the first worker
+    by name, so the same results always give the same database whatever order the nodes
+    finished in. A key is only merged once, so this only holds for the results which were in
+    when it was merged. A result a node sends for a key after a partial merge, e.g. after
+    stopping the coordinator, is kept in results but not merged. Returns the number of keys merged.
+
+    con [sqlite3.Connection] - Connection to the canonical database in autocommit mode.
+    queue_name [str] - Queue whose results are merged.
+    handlers [dict] - Handler functions by name, e.g. {"write_project": write_project}."""
+    cur = con.cursor()
+    cur.execute("BEGIN IMMEDIATE")
+    rows = cur.execute("""SELECT key, worker, writes FROM results r
+        WHERE queue = ? AND NOT merged
+        AND NOT EXISTS (SELECT 1 FROM results m WHERE m.queue = r.queue AND m.key = r.key AND m.merged)
+        AND EXISTS (SELECT 1 FROM jobs j WHERE j.queue = r.queue AND j.key = r.key AND j.state IN (?, ?))
+        ORDER BY key, worker""", (queue_name, job_queue.DONE, job_queue.FAILED)).fetchall()
+
+    merged = set()
+    for key, worker, writes in rows:
+        if key in merged:
+            continue
+        for name, args in json.loads(writes):
+            try:
+                handlers[name](cur, *args)
+            except Exception:
+                logging.error(f"Exception merging {name} of {key} from {worker}\n{traceback.format_exc()}")
+        cur.execute("UPDATE results SET merged = 1 WHERE queue = ? AND key = ? AND worker = ?",
+                    (queue_name, key, worker))
+        merged.add(key)
+    cur.execute("COMMIT")
+    return len(merged)
+
+
+class CoordinatorServer(ThreadingHTTPServer):
+    """
+    Http service which hands out the jobs in the jobs table of the canonical database to
+    worker nodes and stores the writes they send back in the results table.
+
+    address [tuple] - (host, port) to listen on.
+    database [str] - Path to the canonical database. The jobs and results tables must exist.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, database):
+        super().__init__(address, CoordinatorRequestHandler)
+        self.database = database
+        self.lock = threading.Lock()
+        self.con = sqlite3.connect(database, timeout=60, isolation_level=None, check_same_thread=False)
+        self.queues = {}
+
+    def get_queue(self, name):
+        if name not in self.queues:
+            self.queues[name] = job_queue.JobQueue(self.database, name)
+        return self.queues[name]
+
+    def handle_action(self, action, body):
+        """Runs an action sent by a node and returns its json response."""
+        queue = self.get_queue(body["queue"])
+        if action == "add":
+            return {"added": queue.add((key, tuple(args)) for key, args in body["jobs"])}
+        if action == "lease":
+            return {"jobs": queue.lease(body["n"], body["worker"])}
+        if action == "done":
+            cur = self.con.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            # Only the node holding the lease may finish a job, not one whose lease expired and
+            # went to another node, or whose job was failed or done meanwhile.
+            leased = cur.execute("SELECT 1 FROM jobs WHERE queue = ? AND key = ? AND state = ? AND worker = ?",
+                                 (queue.name, body["key"], job_queue.LEASED, body["worker"])).fetchone()
+            if leased:
+                cur.execute("INSERT OR REPLACE INTO results (queue, key, worker, writes) VALUES (?, ?, ?, ?)",
+                            (queue.name, body["key"], body["worker"], json.dumps(body["writes"])))
+                job_queue.mark_done(cur, queue.name, body["key"])
+            cur.execute("COMMIT")
+            if not leased:
+                logging.info(f"Ignored result of {body['key']} from {body['worker']}, which doesn't hold its lease.")
+            return {"accepted": bool(leased)}
+        if action == "fail":
+            queue.fail(body["key"], body["error"])
+            return {}
+        if action == "quarantine":
+            queue.quarantine(body["key"], body["error"])
+            return {}
+        if action == "release":
+            queue.release_own(body["worker"])
+            return {}
+        if action == "counts":
+            return {"counts": queue.counts()}
+        raise ValueError(f"Unknown action {action}")
+
+
+class CoordinatorRequestHandler(BaseHTTPRequestHandler):
+    """Calls CoordinatorServer.handle_action with the json body of POST /<action>."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        try:
+            with self.server.lock:
+                response = self.server.handle_action(self.path.strip("/"), body)
+            status = 200
+        except Exception as e:
+            logging.error(f"Exception in coordinator {self.path}\n{traceback.format_exc()}")
+            response, status = {"error": repr(e)}, 500
+
+        data = json.dumps(response).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+
+class RemoteJobQueue:
+    """
+    A job queue of a coordinator on another machine with the methods of job_queue.JobQueue
+    used by job_queue.run_jobs. Jobs report their writes to the coordinator instead of the
+    local database writer. Picklable so pool workers can report their jobs.
+
+    url [str] - Url of the coordinator, e.g. "http://192.168.1.10:8765".
+    name [str] - Name of the queue.
+    worker [str] - Name of this node. The host name by default.
+    """
+
+    def __init__(self, url, name, worker=None):
+        self.url = url.rstrip("/")
+        self.name = name
+        self.worker = worker or socket.gethostname()
+        self.remote = self
+
+    def _post(self, action, **body):
+        # Values json can't encode, e.g. dates, are sent as strings.
+        data = json.dumps({"queue": self.name, **body}, default=str)
+        response = requests.post(f"{self.url}/{action}", data=data, headers={"Content-Type": "application/json"},
+                                 timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def add(self, jobs):
+        return self._post("add", jobs=list(jobs))["added"]
+
+    def lease(self, n):
+        return [(key, tuple(args)) for key, args in self._post("lease", n=n, worker=self.worker)["jobs"]]
+
+    def done(self, key, writes):
+        """Sends the (handler, args) writes of a finished job. Handlers are sent by name. The
+        coordinator ignores them if this node no longer holds the job's lease."""
+        self._post("done", key=key, worker=self.worker, writes=[(handler.__name__, args) for handler, args in writes])
+
+    def fail(self, key, error):
+        self._post("fail", key=key, error=error)
+
+    def quarantine(self, key, error):
+        self._post("quarantine", key=key, error=error)
+
+    def release_own(self):
+        self._post("release", worker=self.worker)
+
+    def counts(self):
+        return self._post("counts")["counts"]
+
+    def close(self):
+        pass
+
+
+def serve(database, queue_name, jobs, handlers, host=HOST, port=PORT):
+    """Runs the coordinator of a sharded run. Adds jobs to the queue, hands them out to worker
+    nodes until every job is done or failed, then merges the nodes' results into the database.
+    Stopping it with ctrl+c also merges the results so far.
+
+    database [str] - Path to the canonical database. The jobs and results tables must exist.
+    queue_name [str] - Name of the queue, the same as the nodes use.
+    jobs [iterable] - (key, args) of the jobs to add. Jobs already in the queue are skipped.
+    handlers [dict] - Write handlers of the nodes by name, see merge_results."""
+    queue = job_queue.JobQueue(database, queue_name)
+    logging.info(f"Added {queue.add(jobs)} jobs to {queue_name}.")
+
+    server = CoordinatorServer((host, port), database)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Coordinating {queue_name} on {host}:{port}...")
+    try:
+        while True:
+            counts = queue.counts()
+            if not any(counts.get(state) for state in (job_queue.PENDING, job_queue.LEASED, job_queue.QUARANTINED)):
+                break
+            time.sleep(job_queue.POLL_SECONDS)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        with server.lock:
+            logging.info(f"Merged {merge_results(server.con, queue_name, handlers)} results into {database}.")
+        server.con.close()
+        queue.close()
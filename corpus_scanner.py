@@ -0,0 +1,86 @@
+import json
+import os
+import sqlite3
+
+# Settings.
+
+# File the listing of every folder is cached in between runs. None to list every folder each run.
+LISTING_CACHE = "listing_cache.db"
+# Number of folders listed between commits of the cache.
+COMMIT_EVERY = 1000
+
+
+# Script.
+
+class ListingCache:
+    """
+    Names of the files and subfolders of folders with the modification time of the folder when
+    they were listed. A folder's modification time changes when files are added, removed or
+    renamed in it, so a cached listing with the same time is still right.
+
+    path [str] - Path to the cache database. Created if it doesn't exist.
+    """
+
+    def __init__(self, path):
+        self.con = sqlite3.connect(path)
+        self.con.execute("CREATE TABLE IF NOT EXISTS listing (dir TEXT PRIMARY KEY, mtime REAL, files TEXT, dirs TEXT)")
+        self._uncommitted = 0
+
+    def get(self, dir_path, mtime):
+        """Returns (files, dirs) of dir_path if it was listed at mtime, and None otherwise."""
+        row = self.con.execute("SELECT files, dirs FROM listing WHERE dir = ? AND mtime = ?", (dir_path, mtime)).fetchone()
+        if row == None:
+            return None
+        return json.loads(row[0]), json.loads(row[1])
+
+    def put(self, dir_path, mtime, files, dirs):
+        self.con.execute("INSERT OR REPLACE INTO listing VALUES (?, ?, ?, ?)",
+                         (dir_path, mtime, json.dumps(files), json.dumps(dirs)))
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_EVERY:
+            self.con.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self.con.commit()
+        self.con.close()
+
+
+def list_dir(dir_path):
+    """Returns the names of the files and of the subfolders in dir_path, listed with os.scandir
+    so no file is stat'ed on its own."""
+    files, dirs = [], []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.name)
+            elif entry.is_file():
+                files.append(entry.name)
+    return files, dirs
+
+
+def scan(path, cache_path=LISTING_CACHE):
+    """Yields (dir_path, files) for path and every folder under it, depth first, with files the
+    names of the files in dir_path. Folders are yielded as soon as they are listed so work can
+    start before the whole tree is scanned. Folders unchanged since the last scan are read from
+    the listing cache instead of being listed again.
+
+    path [str] - Folder to scan.
+    cache_path [str] - Path to the listing cache. LISTING_CACHE by default. None to not cache."""
+    cache = ListingCache(cache_path) if cache_path != None else None
+    try:
+        stack = [path]
+        while stack:
+            dir_path = stack.pop()
+            mtime = os.stat(dir_path).st_mtime
+            listing = cache.get(dir_path, mtime) if cache != None else None
+            if listing == None:
+                listing = list_dir(dir_path)
+                if cache != None:
+                    cache.put(dir_path, mtime, *listing)
+            files, dirs = listing
+            yield dir_path, files
+            stack.extend(os.path.join(dir_path, name) for name in reversed(dirs))
+    finally:
+        if cache != None:
+            cache.close()
@@ -1,440 +1,575 @@
-import re
-import time
-from datetime import datetime
-import json
-import random
-import logging
-import os
-import winsound
-import multiprocessing
-import sqlite3
-import traceback
-
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-
-import pyautogui
-from bs4 import BeautifulSoup
-
-# Location of creator_ids.json
-CREATOR_FILE_PATH = r"D:\remaining_creator_ids_0.json"
-# Output file path.
-OUTPUT_PATH = r"D:"
-# Chromedriver path
-CHROMEDRIVER_PATH = r"C:\Users\jaber\OneDrive\Desktop\Research_JaberChowdhury\Kickstarter-Data-Scraper\chromedriver.exe"
-# Proton vpn windows taskbar location.
-icon_num = 5 
-
-# Number of processes per try.
-chunk_size = 10
-# Set logging.
-logging.getLogger('uc').setLevel(logging.ERROR)
-logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO, datefmt='%m/%d/%Y %I:%M:%S %p')
-# Pyautogui settings.
-pyautogui.PAUSE = 1
-pyautogui.FAILSAFE = True
-
-# Lock to prevent multiple processes from trying to access database.
-db_lock = multiprocessing.Lock()
-
-def main():
-    with open(CREATOR_FILE_PATH, "r") as f_obj:
-        creator_ids = json.load(f_obj)
-    os.makedirs(OUTPUT_PATH, exist_ok=True)
-
-    # Get connection to database file.
-    con = create_creators_db(OUTPUT_PATH)
-    cur = con.cursor()
-
-    deleted = set(cid[0] for cid in cur.execute("SELECT creator_id FROM deleted_creators;"))
-    extracted_creators = set(cid[0] for cid in cur.execute("SELECT creator_id FROM creator;"))
-    aliases = set(cid[0] for cid in cur.execute("SELECT alias FROM creator_alias;"))
-    con.close()
-
-    skip = extracted_creators | deleted | aliases
-    creator_ids = [creator_id for creator_id in creator_ids if creator_id not in skip]
-
-    pool = multiprocessing.Pool()
-
-    click_random(icon_num)
-    total = 0
-    for i in range(0, len(creator_ids), chunk_size):
-        while True:
-            try:
-                pool.map(extract_write, creator_ids[i:i + chunk_size])
-            except Exception:
-                logging.info(f"\nException -\n {traceback.format_exc()} \nRetrying...")
-                click_random(icon_num)
-                time.sleep(10)
-            else:
-                break      
-            
-        # Stop scraping for a period of time to not be blocked as a bot.
-        total += chunk_size
-        if total % (chunk_size * 10) == 0:
-            logging.info("Sleeping...\n")
-            click_random(icon_num)
-    
-    pool.close()
-    pool.join()
-
-def create_creators_db(path):
-    """
-    Creates creators.db in path and returns a connection.
-    
-    path[str] - Location to save/load 'creators.db'
-    """
-    con = sqlite3.connect(os.path.join(path, "creators.db"))
-    cur = con.cursor()
-
-    # Table for creators data.
-    cur.execute("""CREATE TABLE IF NOT EXISTS creator(
-                url	TEXT,
-                creator_id	TEXT UNIQUE,
-                join_day INTEGER,	
-                join_month INTEGER,
-                join_year INTEGER,	
-                location TEXT,	
-                biography TEXT,	
-                num_backed INTEGER,	
-                num_created INTEGER,	
-                num_websites INTEGER,
-                has_facebook INTEGER,
-                has_twitter INTEGER,
-                has_instagram INTEGER,	
-                websites TEXT,	
-                comments_hidden	INTEGER,
-                num_comments INTEGER,	
-                comments TEXT, 	
-                created_projects TEXT,	
-                backed_projects TEXT
-                    )""")
-    
-    # Table for deleted creators.
-    cur.execute("""CREATE TABLE IF NOT EXISTS deleted_creators(
-                creator_id TEXT UNIQUE
-    )
-        """)
-
-    # Table for storing alternate creator ids.
-    cur.execute("""CREATE TABLE IF NOT EXISTS creator_alias(
-	            actual TEXT UNIQUE,
-	            alias TEXT
-    )          
-                """)
-
-    con.commit()
-    return con
-
-def click_random(icon_num, wait=True):
-    """
-    Clicks random button in proton vpn. Proton VPN needs
-    to be open on the profiles page. 
-    
-    icon_num [int] - Index of proton vpn icon on the windows taskbar.
-    wait [bool] - If True, function will sleep for 10s to make sure Proton Vpn
-    connects and otherwise it will not sleep. True by default.
-    """
-    pyautogui.hotkey('win', str(icon_num))
-    pyautogui.click(333, 563, clicks=3, interval=0.15)
-    time.sleep(2)
-    pyautogui.hotkey('alt', 'tab')
-    if wait:
-        time.sleep(10)
-
-def get_digits(string, conv="float"):
-    """Returns only digits from string as a single int/float. Default
-    is float. Returns empty string if no digit found.
-
-    Inputs: 
-    string[str] - Any string.
-    conv[str] - Enter "float" if you need float. Otherwise will provide integer."""
-    if conv == "float":
-        res = re.findall(r'[0-9.]+', string)
-        if res == "":
-            return ""
-        return float("".join(res))
-    else:
-        res = re.findall(r'\d+', string)
-        if res == "":
-            return ""
-        return int("".join(res))
-    
-def get_live_soup(link, scroll=False, given_driver=None):
-    """Returns a bs4 soup object of the given link. Returns None if it is a deleted kickstarter account.
-    
-    link [str] - A link to a website.
-    scroll [bool] - True if you want selenium to keep scrolling down till loading no longer happens.
-    False by default.
-    given_driver [selenium webdriver] - A webdriver. None by default."""
-    if given_driver == None:
-        driver = uc.Chrome(driver_executable_path=CHROMEDRIVER_PATH)
-    else:
-        driver = given_driver
-    driver.get(link)
-
-    soup = BeautifulSoup(driver.page_source, "lxml")
-
-    # If there is a capcha, Beep and sleep.
-    capcha_elem = soup.select_one('div[id="px-captcha"]')
-    if capcha_elem != None:
-        winsound.Beep(440, 1000)        
-        time.sleep(30)
-    
-    if not scroll:
-        time.sleep(1)
-    else:
-        scroll_num = 1
-        while True:
-            # Scroll down to bottom
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-
-            # Wait to scroll. Notify if unusually high number of scrolls (which may mean that
-            # there is a 403 error).
-            # if scroll_num % 60 == 0:
-            #     winsound.Beep(440, 1000)
-            #     time.sleep(15)
-
-            if scroll_num >= 2:
-                time.sleep(random.uniform(1, 2))
-
-            scroll_num += 1
-
-            # Stop scrolling if no longer loading.
-            try:
-                elem = driver.find_element(By.CSS_SELECTOR, 'li[data-last_page="true"]')
-            except:
-                continue
-            else:
-                break
-
-    soup = BeautifulSoup(driver.page_source, "lxml")
-
-    # If it is a deleted account or there is a 404 error, return.
-    deleted_elem = soup.select_one('div[class="center"]')
-    non_existent_elem = soup.select_one('a[href="/?ref=404-ksr10"]')
-    if deleted_elem != None or non_existent_elem != None:
-        driver.quit()
-        return
-    
-    if given_driver == None:
-        driver.quit()
-
-    return soup
-
-def extract_elem_text(soup, selector):
-    """Returns resulting text of using given selector in soup.
-    If there was no text, returns empty string. 
-    
-    Inputs:
-    soup[bs4.BeautifulSoup] - A soup.
-    selector[str] - A css selector."""
-    elem = soup.select_one(selector)
-    if elem == None:
-        return ""
-    else:
-        return elem.getText()
-
-def parse_data_project(data_project):
-    """Parses a kickstarter data project dictionary and returns a dictionary of
-    required keys.
-    
-    data-project [dict]- A kickstarter data project dict."""
-    result = {}
-
-    result['name'] = data_project['name']
-    result['url'] = data_project['urls']['web']['project']
-    result['creator_id'] = data_project['creator']['id']
-    result['blurb'] = data_project['blurb']
-
-    # Convert currencies to USD.
-    result['original_currency'] = data_project['currency']
-    result['converted_currency'] = 'USD'
-    result['conversion_rate'] = data_project['static_usd_rate']
-    result['goal'] = data_project['goal'] * data_project['static_usd_rate']
-    result['pledged'] = data_project['usd_pledged']
-
-    result['backers'] = data_project['backers_count']
-    result['state'] = data_project['state'].title()
-    result['pwl'] = int(data_project['staff_pick'])
-    result['location'] = data_project.get('location', {}).get('short_name', "")
-
-    if 'parent_name' in data_project['category']:
-        result['subcategory'] = data_project['category']['name']
-        result['category'] = data_project['category']['parent_name']
-    else:
-        result['subcategory'] = ""
-        result['category'] = data_project['category']['name']
-
-    result['created_date'] = datetime.fromtimestamp(data_project['created_at']).strftime('%Y-%m-%d')
-    result['launched_date'] = datetime.fromtimestamp(data_project['launched_at']).strftime('%Y-%m-%d')
-    result['deadline_date'] = datetime.fromtimestamp(data_project['deadline']).strftime('%Y-%m-%d')
-
-    return result
-
-def extract_creator_data(path, is_link=True):
-    """Returns a dictionary of the data for the creator. If passed a file, it should be of
-    a format like 'Dice Dungeons — About.html'. Returns None in case of a deleted account."""
-    data = {}
-
-    if is_link:
-        try:
-            driver = uc.Chrome(driver_executable_path=CHROMEDRIVER_PATH)
-            # Extract data from available pages.
-            about_soup = get_live_soup(path + "/about", given_driver=driver)
-
-            if about_soup == None:
-                return 
-            
-            # There may be multiple pages for created projects.
-            created_soup = get_live_soup(path + "/created", given_driver=driver)
-            created_soups = [created_soup]
-            while True:
-                next_elem = created_soup.select_one('a[rel="next"]')
-
-                # No further pages.
-                if next_elem == None:
-                    break   
-                
-                created_soup = get_live_soup("https://www.kickstarter.com/" + next_elem['href'], given_driver=driver)
-                created_soups.append(created_soup)
-
-            # Do not try to scrap pages if they are not public. 
-            comment_soup = None
-            # if about_soup.select_one('a[class="nav--subnav__item__link nav--subnav__item__link--gray js-comments-link"]') != None:
-            #     comment_soup = get_live_soup(path + "/comments", True, driver)
-            # else:
-            #     comment_soup = None
-
-            # Number of projects backed.
-            backed = extract_elem_text(about_soup, 'span[class="backed"]')
-            backed = get_digits(backed, "int")
-
-            if about_soup.select_one('a[class="nav--subnav__item__link nav--subnav__item__link--gray js-backed-link"]') != None and backed != 0:
-                backed_soup = get_live_soup(path, True, driver)
-            else:
-                backed_soup = None
-        except Exception:
-            raise Exception
-        finally:
-            driver.quit()
-    else:
-        with open(path + " — About.html", encoding='utf8', errors="backslashreplace") as infile:
-            about_soup = BeautifulSoup(infile, "lxml")
-        with open(path + " — Comments.html", encoding='utf8', errors="backslashreplace") as infile:
-            comment_soup = BeautifulSoup(infile, "lxml")
-        with open(path + " — Created.html", encoding='utf8', errors="backslashreplace") as infile:
-            created_soup = BeautifulSoup(infile, "lxml")
-        if about_soup.select_one('a[class="nav--subnav__item__link nav--subnav__item__link--gray js-backed-link"]') != None:
-            with open(path + " — Backed.html", encoding='utf8', errors="backslashreplace") as infile:
-                backed_soup = BeautifulSoup(infile, "lxml")
-        else:
-            backed_soup = None                  
-
-    # Creator id.
-    url_elem = about_soup.select_one('meta[property="og:url"]')
-    data["url"] = url_elem["content"]
-
-    # Project Id and Creator Id.
-    data["creator_id"] = data["url"].split("/")[-1]
-
-    # Join date.
-    join_day, join_month, join_year = "", "", ""
-    join_date_elem = about_soup.select_one('span[class="joined"] > time')
-    if join_date_elem != None:
-        try:
-            join_date = datetime.strptime(join_date_elem['datetime'], '%Y-%m-%dT%H:%M:%S%z')
-        except ValueError:
-            join_date = datetime.strptime(join_date_elem['datetime'], '%Y-%m-%d')
-        join_day, join_month, join_year = join_date.day, join_date.month, join_date.year
-        
-    data['join_day'], data['join_month'], data['join_year'] = join_day, join_month, join_year
-
-    # Location.
-    data['location'] = extract_elem_text(about_soup, 'span[class="location do-not-visually-track"] > a')
-
-    # Biography.
-    data['biography'] = extract_elem_text(about_soup, 'div[class="grid-col-12 grid-col-8-sm grid-col-6-md"]').strip()
-
-    data['num_backed'] = backed
-
-    # Number of created projects.
-    data['num_created'] = extract_elem_text(about_soup, 'a[class="nav--subnav__item__link nav--subnav__item__link--gray js-created-link"] > span').strip()
-
-    # Websites.
-    websites = [elem['href'] for elem in about_soup.select('ul[class="menu-submenu mb6"] > li > a')]
-    data['num_websites'] = len(websites)
-    data['has_facebook'] = int(any("facebook" in website for website in websites))
-    data['has_twitter'] = int(any("twitter" in website for website in websites))
-    data['has_instagram'] = int(any("instagram" in website for website in websites))
-    data['websites'] = websites
-
-    # Comments.
-    comments = []
-    if comment_soup != None:
-        comment_elems = comment_soup.select('li[class="page flex flex-wrap"] > ol > li')
-        for comment_elem in comment_elems:
-            comment_str = comment_elem.select_one('p[class="body"]').getText()
-            link = "https://www.kickstarter.com" + comment_elem.select_one('a[class="read-more"]')['href']
-            date = comment_elem.select_one('a[class="read-more"] > time').getText()
-            comments.append((comment_str, date, link))
-
-    data['comments_hidden'] = int(comment_soup == None)
-    data['num_comments'] = len(comments)
-    data['comments'] = comments
-
-    # Created projects.
-    created_data_projects = []
-    for created_soup in created_soups:
-        created_project_elem = created_soup.select_one('div[data-projects]')
-        created_data_projects.extend(json.loads(created_project_elem['data-projects']))
-
-    created_projects = []
-    for created_data_project in created_data_projects:
-        created_projects.append(parse_data_project(created_data_project))
-    data['created_projects'] = created_projects
-
-    # Backed projects.
-    backed_projects = []
-    if backed_soup != None:
-        backed_data_projects = [json.loads(elem['data-project']) for elem in backed_soup.select('div[data-project]')]
-        for backed_data_project in backed_data_projects:
-            backed_projects.append(parse_data_project(backed_data_project))   
-    data['backed_projects'] = backed_projects
-
-    # Serialize lists to make it possible to add them as TEXT type in sql table.
-    data['websites'] = json.dumps(data['websites'])
-    data['comments'] = json.dumps(data['comments'])
-    data['created_projects'] = json.dumps(data['created_projects'])
-    data['backed_projects'] = json.dumps(data['backed_projects'])
-    
-    return data
-
-def extract_write(creator_id):
-    """Takes a creator_id, extracts data from pages and adds data to database."""
-    logging.info(f"Started extracting {creator_id} data...")
-    creator_datum = extract_creator_data(r"https://www.kickstarter.com/profile/" + creator_id)
-
-    with db_lock:
-        con = sqlite3.connect(os.path.join(OUTPUT_PATH, "creators.db"))
-        cur = con.cursor()
-
-        # Add creator to deleted_creators table.
-        if creator_datum == None:
-            cur.execute("INSERT OR IGNORE INTO deleted_creators VALUES (?)", (creator_id,))
-            logging.info(f"Added {creator_id} to table...")
-        # Add data to creator table.
-        else:
-            cur.execute("INSERT OR IGNORE INTO creator VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", tuple(creator_datum.values()))
-
-            # Creator has alternate creator id.
-            if creator_id != creator_datum['creator_id']:
-                cur.execute("INSERT OR IGNORE INTO creator_alias VALUES (?, ?)", (creator_datum['creator_id'], creator_id))
-    
-            logging.info(f"Added {creator_id} to table...")
-        
-        con.commit()
-        con.close()
-
-if __name__ == "__main__":
-    main()
+import re
+import time
+from datetime import datetime
+import json
+import itertools
+import logging
+import os
+import multiprocessing
+import sqlite3
+
+import undetected_chromedriver as uc
+
+import pyautogui
+from bs4 import BeautifulSoup
+
+from driver_pool import get_driver_pool
+import http_fetcher
+from page_cache import get_page_cache
+import page_analysis
+import db_writer
+import job_queue
+import coordinator
+import async_fetcher
+import rate_control
+import egress
+import resource_filter
+import page_waits
+
+# Location of creator_ids.json
+CREATOR_FILE_PATH = r"D:\remaining_creator_ids_0.json"
+# Output file path.
+OUTPUT_PATH = r"D:"
+# Folder of the raw page cache. Pages are only fetched live if they aren't cached or are stale.
+CACHE_PATH = os.path.join(OUTPUT_PATH, "page_cache")
+# Seconds after which a cached page is fetched again. None to never fetch cached pages again.
+CACHE_MAX_AGE = None
+# Chromedriver path
+CHROMEDRIVER_PATH = r"C:\Users\jaber\OneDrive\Desktop\Research_JaberChowdhury\Kickstarter-Data-Scraper\chromedriver.exe"
+# Proton vpn windows taskbar location.
+icon_num = 5 
+# Set to True to fetch pages over plain HTTP first and only use a browser when needed.
+HTTP_FIRST = True
+# Set to True to fetch about and created pages concurrently with asyncio (see main_async).
+ASYNC_FETCH = False
+# Maximum number of requests in flight and started per second for kickstarter.com.
+per_host_concurrency = 8
+rate_limit = 4
+# Set to "coordinator" to hand out the creators to worker nodes and merge their results into creators.db,
+# "node" to extract creators for the coordinator at COORDINATOR_URL or "local" to extract on this machine only.
+ROLE = "local"
+# Address of the coordinator for "node". Defaults to one on this machine. Set to
+# "http://<coordinator's ip>:8765" for a coordinator on another machine.
+COORDINATOR_URL = f"http://127.0.0.1:{coordinator.PORT}"
+# Number of creators a browser extracts before it is replaced with a fresh one.
+driver_pages = 10
+
+# Number of creators being extracted or waiting for a free process at a time.
+chunk_size = 10
+# Set logging.
+logging.getLogger('uc').setLevel(logging.ERROR)
+logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO, datefmt='%m/%d/%Y %I:%M:%S %p')
+# Pyautogui settings.
+pyautogui.PAUSE = 1
+pyautogui.FAILSAFE = True
+# Change server whenever the rate controller of a process keeps getting blocked.
+rate_control.get_rate_controller().on_rotate = lambda: click_random(icon_num)
+
+def main():
+    creator_ids = get_creator_ids()
+    # Creators waiting to be extracted. Creators left leased by a crashed run are extracted again.
+    jobs = job_queue.JobQueue(os.path.join(OUTPUT_PATH, "creators.db"), "creators")
+    jobs.release_own()
+    jobs.add((creator_id, (creator_id,)) for creator_id in creator_ids)
+
+    # Only the writer process touches the database. Workers send it their results.
+    writer = db_writer.DBWriter(create_creators_db, OUTPUT_PATH).start()
+    pool = multiprocessing.Pool(initializer=db_writer.init_worker, initargs=(writer.queue,))
+
+    click_random(icon_num)
+    # Failed creators are retried by the queue up to job_queue.MAX_ATTEMPTS times. Each worker paces
+    # its own requests and changes server when they keep getting blocked (see rate_control).
+    job_queue.run_jobs(pool, jobs, extract_write, chunk_size)
+
+    jobs.close()
+    pool.close()
+    pool.join()
+    writer.close()
+
+def main_coordinator():
+    """Hands out the creators of CREATOR_FILE_PATH which aren't extracted yet to worker nodes and
+    merges their results into creators.db once every creator is done. See coordinator.serve."""
+    creator_ids = get_creator_ids()
+    coordinator.serve(os.path.join(OUTPUT_PATH, "creators.db"), "creators",
+                      ((creator_id, (creator_id,)) for creator_id in creator_ids), {"write_creator": write_creator})
+
+def main_node():
+    """Extracts creators leased from the coordinator at COORDINATOR_URL and sends the results
+    back to it instead of writing them to creators.db."""
+    jobs = coordinator.RemoteJobQueue(COORDINATOR_URL, "creators")
+    jobs.release_own()
+    pool = multiprocessing.Pool()
+
+    click_random(icon_num)
+    job_queue.run_jobs(pool, jobs, extract_write, chunk_size)
+
+    pool.close()
+    pool.join()
+
+def main_async():
+    """Fetches the about and created pages of every creator concurrently over HTTP with
+    async_fetcher into the page cache and queues each creator once its pages are fetched, so
+    extract_write reads them from the cache. Creators are run by job_queue.run_jobs like in main,
+    so failed creators are retried and blocked creators are quarantined. Requests in flight are
+    bounded by per_host_concurrency and rate_limit instead of the number of processes. Remaining
+    pages and pages which need a browser are loaded with the driver pool."""
+    creator_ids = get_creator_ids()
+    jobs = job_queue.JobQueue(os.path.join(OUTPUT_PATH, "creators.db"), "creators")
+    jobs.release_own()
+    writer = db_writer.DBWriter(create_creators_db, OUTPUT_PATH).start()
+    pool = multiprocessing.Pool(initializer=db_writer.init_worker, initargs=(writer.queue,))
+    
+    def pages_of(creator_id):
+        path = r"https://www.kickstarter.com/profile/" + creator_id
+        return [async_fetcher.Page(path + "/about", http_fetcher.ABOUT_MARKERS, http_fetcher.MISSING_MARKERS),
+                async_fetcher.Page(path + "/created", http_fetcher.CREATED_MARKERS, http_fetcher.MISSING_MARKERS)]
+
+    fetched = async_fetcher.fetch_iter(creator_ids, pages_of, per_host_concurrency, rate_limit,
+                                       cache=get_page_cache(CACHE_PATH), max_age=CACHE_MAX_AGE)
+
+    def refill(chunk):
+        # Queue creators as their pages come in. Pages which need a browser aren't cached.
+        fetched_ids = [creator_id for creator_id, _ in itertools.islice(fetched, chunk)]
+        jobs.add((creator_id, (creator_id,)) for creator_id in fetched_ids)
+        return fetched_ids
+
+    job_queue.run_jobs(pool, jobs, extract_write, chunk_size, refill=refill)
+
+    jobs.close()
+    pool.close()
+    pool.join()
+    writer.close()
+    http_fetcher.log_stats()
+
+def get_creator_ids():
+    """Returns creator ids from CREATOR_FILE_PATH which aren't already extracted, deleted
+    or known aliases."""
+    with open(CREATOR_FILE_PATH, "r") as f_obj:
+        creator_ids = json.load(f_obj)
+    os.makedirs(OUTPUT_PATH, exist_ok=True)
+
+    # Get connection to database file.
+    con = create_creators_db(OUTPUT_PATH)
+    cur = con.cursor()
+
+    deleted = set(cid[0] for cid in cur.execute("SELECT creator_id FROM deleted_creators;"))
+    extracted_creators = set(cid[0] for cid in cur.execute("SELECT creator_id FROM creator;"))
+    aliases = set(cid[0] for cid in cur.execute("SELECT alias FROM creator_alias;"))
+    con.close()
+
+    skip = extracted_creators | deleted | aliases
+    return [creator_id for creator_id in creator_ids if creator_id not in skip]
+
+def create_creators_db(path):
+    """
+    Creates creators.db in path and returns a connection.
+    
+    path[str] - Location to save/load 'creators.db'
+    """
+    con = sqlite3.connect(os.path.join(path, "creators.db"))
+    cur = con.cursor()
+
+    # Table for creators data.
+    cur.execute("""CREATE TABLE IF NOT EXISTS creator(
+                url	TEXT,
+                creator_id	TEXT UNIQUE,
+                join_day INTEGER,	
+                join_month INTEGER,
+                join_year INTEGER,	
+                location TEXT,	
+                biography TEXT,	
+                num_backed INTEGER,	
+                num_created INTEGER,	
+                num_websites INTEGER,
+                has_facebook INTEGER,
+                has_twitter INTEGER,
+                has_instagram INTEGER,	
+                websites TEXT,	
+                comments_hidden	INTEGER,
+                num_comments INTEGER,	
+                comments TEXT, 	
+                created_projects TEXT,	
+                backed_projects TEXT
+                    )""")
+    
+    # Table for deleted creators.
+    cur.execute("""CREATE TABLE IF NOT EXISTS deleted_creators(
+                creator_id TEXT UNIQUE
+    )
+        """)
+
+    # Table for storing alternate creator ids.
+    cur.execute("""CREATE TABLE IF NOT EXISTS creator_alias(
+	            actual TEXT UNIQUE,
+	            alias TEXT
+    )          
+                """)
+
+    # Creators waiting to be extracted and results of worker nodes waiting to be merged.
+    job_queue.create_jobs_table(cur)
+    coordinator.create_results_table(cur)
+
+    con.commit()
+    return con
+
+def click_random(icon_num, wait=True):
+    """
+    Clicks random button in proton vpn. Proton VPN needs
+    to be open on the profiles page. 
+    
+    icon_num [int] - Index of proton vpn icon on the windows taskbar.
+    wait [bool] - If True, function will sleep for 10s to make sure Proton Vpn
+    connects and otherwise it will not sleep. True by default.
+    Does nothing if egress.PROXIES are set.
+    """
+    if egress.PROXIES:
+        # Proxies are rotated by egress instead.
+        return
+    pyautogui.hotkey('win', str(icon_num))
+    pyautogui.click(333, 563, clicks=3, interval=0.15)
+    time.sleep(2)
+    pyautogui.hotkey('alt', 'tab')
+    if wait:
+        time.sleep(10)
+
+def create_driver():
+    """Returns a new undetected chrome webdriver which goes out through the next proxy of
+    egress.PROXIES, if any. Used by the driver pool."""
+    chrome_options = uc.ChromeOptions()
+    endpoint = egress.next_endpoint()
+    if endpoint is not None:
+        chrome_options.add_argument(f"--proxy-server={endpoint.server}")
+    driver = uc.Chrome(options=chrome_options, driver_executable_path=CHROMEDRIVER_PATH)
+    # The driver keeps its proxy until it is quit.
+    driver.egress = endpoint
+    # Pages are only parsed, so media, fonts and trackers aren't loaded.
+    return resource_filter.block_resources(driver)
+
+def get_digits(string, conv="float"):
+    """Returns only digits from string as a single int/float. Default
+    is float. Returns empty string if no digit found.
+
+    Inputs: 
+    string[str] - Any string.
+    conv[str] - Enter "float" if you need float. Otherwise will provide integer."""
+    if conv == "float":
+        res = re.findall(r'[0-9.]+', string)
+        if res == "":
+            return ""
+        return float("".join(res))
+    else:
+        res = re.findall(r'\d+', string)
+        if res == "":
+            return ""
+        return int("".join(res))
+    
+def load_page(driver, link):
+    """Loads link in driver once the rate controller allows the next request and records
+    whether the page was blocked. The controller changes server when blocks keep coming.
+    Raises job_queue.Blocked if the page is a captcha or challenge so the creator is
+    quarantined and retried later on another driver instead of in this worker.
+
+    driver [selenium webdriver] - A webdriver.
+    link [str] - A link to a website."""
+    controller = rate_control.get_rate_controller()
+    controller.wait()
+    driver.get(link)
+    outcome = page_analysis.blocked_kind(driver.page_source) or rate_control.OK
+    controller.record(outcome)
+    # A blocked proxy cools down and the lease recycles the driver.
+    egress.report(driver, outcome)
+    if outcome != rate_control.OK:
+        raise job_queue.Blocked(outcome)
+
+def get_live_soup(link, scroll=False, given_driver=None, required=None, html=None, page=None):
+    """Returns a bs4 soup object of the given link. Returns None if it is a deleted kickstarter account.
+    
+    link [str] - A link to a website.
+    scroll [bool] - True if you want selenium to keep scrolling down till loading no longer happens.
+    False by default.
+    given_driver [selenium webdriver] - A webdriver. None by default.
+    required [tuple] - Markers of embedded json. If given, the page is fetched over plain HTTP first
+    and the browser is only used if a marker is missing or there is a captcha. None by default.
+    html [str] - Page source fetched beforehand, e.g. by async_fetcher. None by default.
+    page [str] - Page type waited for in the browser, a key of page_waits.TARGETS. None by default."""
+    cache = get_page_cache(CACHE_PATH)
+    if html == None:
+        html = cache.get(link, CACHE_MAX_AGE)
+    if html == None and HTTP_FIRST and not scroll and required != None:
+        html = http_fetcher.get_html(link, required, http_fetcher.MISSING_MARKERS)
+        if html != None:
+            cache.put(link, html)
+    if html != None:
+        analysis = page_analysis.analyze_page(html, (page_analysis.DELETED, page_analysis.NOT_FOUND))
+        # Deleted account or 404 error.
+        if analysis.kind != page_analysis.OK:
+            return
+        return analysis.soup
+
+    if given_driver == None:
+        driver = create_driver()
+    else:
+        driver = given_driver
+    try:
+        load_page(driver, link)
+    except job_queue.Blocked:
+        if given_driver == None:
+            driver.quit()
+        raise
+    
+    if not scroll:
+        page_waits.wait(driver, page)
+    else:
+        scroll_num = 1
+        while True:
+            # Scroll down to bottom and wait for the next page of projects to load. Notify if
+            # unusually high number of scrolls (which may mean that there is a 403 error).
+            # if scroll_num % 60 == 0:
+            #     winsound.Beep(440, 1000)
+            #     time.sleep(15)
+
+            scroll_num += 1
+
+            # Stop scrolling if no longer loading.
+            if page_waits.wait(driver, "backed", scroll=True) == page_waits.FOUND:
+                break
+
+    html = driver.page_source
+    analysis = page_analysis.analyze_page(html, (page_analysis.DELETED, page_analysis.NOT_FOUND))
+
+    # Keep a raw copy of the page unless it is still a captcha.
+    if analysis.soup != None:
+        cache.put(link, html)
+
+    # If it is a deleted account or there is a 404 error, return.
+    if analysis.kind in (page_analysis.DELETED, page_analysis.NOT_FOUND):
+        if given_driver == None:
+            driver.quit()
+        return
+    
+    if given_driver == None:
+        driver.quit()
+
+    # Quarantine the creator if the page turned into a captcha.
+    if analysis.soup == None:
+        raise job_queue.Blocked(analysis.kind)
+
+    return analysis.soup
+
+def extract_elem_text(soup, selector):
+    """Returns resulting text of using given selector in soup.
+    If there was no text, returns empty string. 
+    
+    Inputs:
+    soup[bs4.BeautifulSoup] - A soup.
+    selector[str] - A css selector."""
+    elem = soup.select_one(selector)
+    if elem == None:
+        return ""
+    else:
+        return elem.getText()
+
+def parse_data_project(data_project):
+    """Parses a kickstarter data project dictionary and returns a dictionary of
+    required keys.
+    
+    data-project [dict]- A kickstarter data project dict."""
+    result = {}
+
+    result['name'] = data_project['name']
+    result['url'] = data_project['urls']['web']['project']
+    result['creator_id'] = data_project['creator']['id']
+    result['blurb'] = data_project['blurb']
+
+    # Convert currencies to USD.
+    result['original_currency'] = data_project['currency']
+    result['converted_currency'] = 'USD'
+    result['conversion_rate'] = data_project['static_usd_rate']
+    result['goal'] = data_project['goal'] * data_project['static_usd_rate']
+    result['pledged'] = data_project['usd_pledged']
+
+    result['backers'] = data_project['backers_count']
+    result['state'] = data_project['state'].title()
+    result['pwl'] = int(data_project['staff_pick'])
+    result['location'] = data_project.get('location', {}).get('short_name', "")
+
+    if 'parent_name' in data_project['category']:
+        result['subcategory'] = data_project['category']['name']
+        result['category'] = data_project['category']['parent_name']
+    else:
+        result['subcategory'] = ""
+        result['category'] = data_project['category']['name']
+
+    result['created_date'] = datetime.fromtimestamp(data_project['created_at']).strftime('%Y-%m-%d')
+    result['launched_date'] = datetime.fromtimestamp(data_project['launched_at']).strftime('%Y-%m-%d')
+    result['deadline_date'] = datetime.fromtimestamp(data_project['deadline']).strftime('%Y-%m-%d')
+
+    return result
+
+def extract_creator_data(path, is_link=True, pages=None):
+    """Returns a dictionary of the data for the creator. If passed a file, it should be of
+    a format like 'Dice Dungeons — About.html'. Returns None in case of a deleted account.
+    pages is an optional dict of page sources fetched beforehand keyed by "about" and "created"."""
+    data = {}
+    pages = pages or {}
+
+    if is_link:
+        # Driver is recycled by the pool if extraction fails.
+        with get_driver_pool(create_driver, max_pages=driver_pages).lease() as driver:
+            # Extract data from available pages.
+            about_soup = get_live_soup(path + "/about", given_driver=driver, required=http_fetcher.ABOUT_MARKERS, html=pages.get("about"), page="about")
+
+            if about_soup == None:
+                return 
+            
+            # There may be multiple pages for created projects.
+            created_soup = get_live_soup(path + "/created", given_driver=driver, required=http_fetcher.CREATED_MARKERS, html=pages.get("created"), page="created")
+            created_soups = [created_soup]
+            while True:
+                next_elem = created_soup.select_one('a[rel="next"]')
+
+                # No further pages.
+                if next_elem == None:
+                    break   
+                
+                created_soup = get_live_soup("https://www.kickstarter.com/" + next_elem['href'], given_driver=driver, required=http_fetcher.CREATED_MARKERS, page="created")
+                created_soups.append(created_soup)
+
+            # Do not try to scrap pages if they are not public. 
+            comment_soup = None
+            # if about_soup.select_one('a[class="nav--subnav__item__link nav--subnav__item__link--gray js-comments-link"]') != None:
+            #     comment_soup = get_live_soup(path + "/comments", True, driver)
+            # else:
+            #     comment_soup = None
+
+            # Number of projects backed.
+            backed = extract_elem_text(about_soup, 'span[class="backed"]')
+            backed = get_digits(backed, "int")
+
+            if about_soup.select_one('a[class="nav--subnav__item__link nav--subnav__item__link--gray js-backed-link"]') != None and backed != 0:
+                backed_soup = get_live_soup(path, True, driver)
+            else:
+                backed_soup = None
+    else:
+        with open(path + " — About.html", encoding='utf8', errors="backslashreplace") as infile:
+            about_soup = BeautifulSoup(infile, "lxml")
+        with open(path + " — Comments.html", encoding='utf8', errors="backslashreplace") as infile:
+            comment_soup = BeautifulSoup(infile, "lxml")
+        with open(path + " — Created.html", encoding='utf8', errors="backslashreplace") as infile:
+            created_soup = BeautifulSoup(infile, "lxml")
+        if about_soup.select_one('a[class="nav--subnav__item__link nav--subnav__item__link--gray js-backed-link"]') != None:
+            with open(path + " — Backed.html", encoding='utf8', errors="backslashreplace") as infile:
+                backed_soup = BeautifulSoup(infile, "lxml")
+        else:
+            backed_soup = None                  
+
+    # Creator id.
+    url_elem = about_soup.select_one('meta[property="og:url"]')
+    data["url"] = url_elem["content"]
+
+    # Project Id and Creator Id.
+    data["creator_id"] = data["url"].split("/")[-1]
+
+    # Join date.
+    join_day, join_month, join_year = "", "", ""
+    join_date_elem = about_soup.select_one('span[class="joined"] > time')
+    if join_date_elem != None:
+        try:
+            join_date = datetime.strptime(join_date_elem['datetime'], '%Y-%m-%dT%H:%M:%S%z')
+        except ValueError:
+            join_date = datetime.strptime(join_date_elem['datetime'], '%Y-%m-%d')
+        join_day, join_month, join_year = join_date.day, join_date.month, join_date.year
+        
+    data['join_day'], data['join_month'], data['join_year'] = join_day, join_month, join_year
+
+    # Location.
+    data['location'] = extract_elem_text(about_soup, 'span[class="location do-not-visually-track"] > a')
+
+    # Biography.
+    data['biography'] = extract_elem_text(about_soup, 'div[class="grid-col-12 grid-col-8-sm grid-col-6-md"]').strip()
+
+    data['num_backed'] = backed
+
+    # Number of created projects.
+    data['num_created'] = extract_elem_text(about_soup, 'a[class="nav--subnav__item__link nav--subnav__item__link--gray js-created-link"] > span').strip()
+
+    # Websites.
+    websites = [elem['href'] for elem in about_soup.select('ul[class="menu-submenu mb6"] > li > a')]
+    data['num_websites'] = len(websites)
+    data['has_facebook'] = int(any("facebook" in website for website in websites))
+    data['has_twitter'] = int(any("twitter" in website for website in websites))
+    data['has_instagram'] = int(any("instagram" in website for website in websites))
+    data['websites'] = websites
+
+    # Comments.
+    comments = []
+    if comment_soup != None:
+        comment_elems = comment_soup.select('li[class="page flex flex-wrap"] > ol > li')
+        for comment_elem in comment_elems:
+            comment_str = comment_elem.select_one('p[class="body"]').getText()
+            link = "https://www.kickstarter.com" + comment_elem.select_one('a[class="read-more"]')['href']
+            date = comment_elem.select_one('a[class="read-more"] > time').getText()
+            comments.append((comment_str, date, link))
+
+    data['comments_hidden'] = int(comment_soup == None)
+    data['num_comments'] = len(comments)
+    data['comments'] = comments
+
+    # Created projects.
+    created_data_projects = []
+    for created_soup in created_soups:
+        created_project_elem = created_soup.select_one('div[data-projects]')
+        created_data_projects.extend(json.loads(created_project_elem['data-projects']))
+
+    created_projects = []
+    for created_data_project in created_data_projects:
+        created_projects.append(parse_data_project(created_data_project))
+    data['created_projects'] = created_projects
+
+    # Backed projects.
+    backed_projects = []
+    if backed_soup != None:
+        backed_data_projects = [json.loads(elem['data-project']) for elem in backed_soup.select('div[data-project]')]
+        for backed_data_project in backed_data_projects:
+            backed_projects.append(parse_data_project(backed_data_project))   
+    data['backed_projects'] = backed_projects
+
+    # Serialize lists to make it possible to add them as TEXT type in sql table.
+    data['websites'] = json.dumps(data['websites'])
+    data['comments'] = json.dumps(data['comments'])
+    data['created_projects'] = json.dumps(data['created_projects'])
+    data['backed_projects'] = json.dumps(data['backed_projects'])
+    
+    return data
+
+def extract_write(creator_id):
+    """Takes a creator_id, extracts data from pages and sends data to the database writer."""
+    logging.info(f"Started extracting {creator_id} data...")
+    creator_datum = extract_creator_data(r"https://www.kickstarter.com/profile/" + creator_id)
+
+    db_writer.write(write_creator, creator_id, creator_datum)
+
+def write_creator(cur, creator_id, creator_datum):
+    """Adds a creator to the database or to deleted_creators if creator_datum is None. Runs in
+    the database writer process."""
+    # Add creator to deleted_creators table.
+    if creator_datum == None:
+        cur.execute("INSERT OR IGNORE INTO deleted_creators VALUES (?)", (creator_id,))
+        logging.info(f"Added {creator_id} to table...")
+    # Add data to creator table.
+    else:
+        cur.execute("INSERT OR IGNORE INTO creator VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", tuple(creator_datum.values()))
+
+        # Creator has alternate creator id.
+        if creator_id != creator_datum['creator_id']:
+            cur.execute("INSERT OR IGNORE INTO creator_alias VALUES (?, ?)", (creator_datum['creator_id'], creator_id))
+
+        logging.info(f"Added {creator_id} to table...")
+
+if __name__ == "__main__":
+    if ROLE == "coordinator":
+        main_coordinator()
+    elif ROLE == "node":
+        main_node()
+    else:
+        main_async() if ASYNC_FETCH else main()
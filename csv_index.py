@@ -0,0 +1,166 @@
+import array
+import csv
+import json
+import logging
+import os
+import threading
+
+# Settings.
+
+# The index of data.csv is saved next to it as data.csv.idx.
+INDEX_SUFFIX = ".idx"
+# Column whose values are kept in the index so rows can be filtered without parsing them.
+STATE_FIELD = "state"
+
+
+# Script.
+
+# Changed whenever the layout of the index file changes so old indexes are rebuilt.
+VERSION = 1
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+class LineReader:
+    """Iterator of the decoded lines of a binary file which keeps the byte offset of the
+    next line, so the offset of each csv row is known without the text layer's buffering."""
+
+    def __init__(self, f_obj):
+        self.f_obj = f_obj
+        self.offset = f_obj.tell()
+
+    def seek(self, offset):
+        self.f_obj.seek(offset)
+        self.offset = offset
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.f_obj.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode("utf8")
+
+
+class CSVIndex:
+    """
+    Byte offset and state of every row of a csv file, saved in a sidecar file next to it.
+    Rows can be read from any row number by seeking instead of reading the file from the
+    start.
+
+    path [str] - Path to the csv file.
+    fieldnames [list] - Header of the csv file.
+    offsets [array.array] - Byte offset of each row. The last entry is the end of the file.
+    states [list] - Distinct values of STATE_FIELD.
+    codes [array.array] - Index in states of each row's STATE_FIELD.
+    """
+
+    def __init__(self, path, fieldnames, offsets, states, codes):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.offsets = offsets
+        self.states = states
+        self.codes = codes
+        # (size, mtime_ns) of the file the index was made for. Set by get_csv_index.
+        self.stat = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def filtered(self, statuses=None):
+        """Returns the row numbers whose STATE_FIELD is in statuses, or every row if None."""
+        if statuses is None:
+            return range(len(self))
+        wanted = {code for code, state in enumerate(self.states) if state in statuses}
+        return array.array("Q", (row_num for row_num, code in enumerate(self.codes) if code in wanted))
+
+    def iter_rows(self, row_nums):
+        """Yields (row_num, row) for each of the ascending row numbers, with rows as dicts like
+        csv.DictReader. Rows in between are skipped by seeking over them.
+
+        row_nums [iterable] - Ascending row numbers, e.g. a slice of filtered."""
+        with open(self.path, "rb") as f_obj:
+            lines = LineReader(f_obj)
+            reader = csv.DictReader(lines, fieldnames=self.fieldnames)
+            next_row = None
+            for row_num in row_nums:
+                if row_num != next_row:
+                    lines.seek(self.offsets[row_num])
+                yield row_num, next(reader)
+                next_row = row_num + 1
+
+    def save(self, index_path, size, mtime_ns):
+        header = {"version": VERSION, "size": size, "mtime_ns": mtime_ns, "rows": len(self),
+                  "fieldnames": self.fieldnames, "states": self.states}
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "wb") as f_obj:
+            f_obj.write(json.dumps(header).encode("utf8") + b"\n")
+            self.offsets.tofile(f_obj)
+            self.codes.tofile(f_obj)
+        os.replace(tmp_path, index_path)
+
+
+def build_index(path):
+    """Reads the csv file once and returns its CSVIndex."""
+    offsets = array.array("Q")
+    codes = array.array("B")
+    states = {}
+    with open(path, "rb") as f_obj:
+        lines = LineReader(f_obj)
+        reader = csv.DictReader(lines)
+        fieldnames = reader.fieldnames or []
+        offset = lines.offset
+        for row in reader:
+            # Skipped blank lines before a row are part of it.
+            offsets.append(offset)
+            offset = lines.offset
+            state = row.get(STATE_FIELD)
+            if state not in states:
+                if len(states) == 255:
+                    raise ValueError(f"Too many distinct values of {STATE_FIELD} in {path} to index.")
+                states[state] = len(states)
+            codes.append(states[state])
+        offsets.append(offset)
+    return CSVIndex(path, fieldnames, offsets, list(states), codes)
+
+
+def load_index(path, index_path, size, mtime_ns):
+    """Returns the saved CSVIndex of path or None if it's missing or was made for another
+    version of the file."""
+    try:
+        with open(index_path, "rb") as f_obj:
+            header = json.loads(f_obj.readline())
+            if (header.get("version"), header.get("size"), header.get("mtime_ns")) != (VERSION, size, mtime_ns):
+                return None
+            offsets = array.array("Q")
+            offsets.fromfile(f_obj, header["rows"] + 1)
+            codes = array.array("B")
+            codes.fromfile(f_obj, header["rows"])
+    except (OSError, ValueError, EOFError, KeyError):
+        return None
+    return CSVIndex(path, header["fieldnames"], offsets, header["states"], codes)
+
+
+def get_csv_index(path):
+    """Returns the CSVIndex of the csv file at path. The sidecar index is built on first use and
+    again whenever the size or modification time of the file no longer matches it.
+
+    path [str] - Path to the csv file."""
+    with _indexes_lock:
+        stat = os.stat(path)
+        index = _indexes.get(path)
+        if index is not None and index.stat == (stat.st_size, stat.st_mtime_ns):
+            return index
+
+        index_path = path + INDEX_SUFFIX
+        index = load_index(path, index_path, stat.st_size, stat.st_mtime_ns)
+        if index is None:
+            logging.info(f"Indexing {path}...")
+            index = build_index(path)
+            index.save(index_path, stat.st_size, stat.st_mtime_ns)
+        index.stat = (stat.st_size, stat.st_mtime_ns)
+        _indexes[path] = index
+        return index
@@ -1,34 +1,43 @@
-import sqlite3
-import csv
-
-from working_ import OUTPUT_PATH
-
-# Usage example:
-DATABASE_FILE = 'new_projects.db'
-TABLE_NAME = 'projects'
-OUTPUT_FILENAME = 'output_db.csv'
-
-
-def convert_sqlite_to_csv(database_file, table_name, csv_file):
-    # Connect to the SQLite database
-    conn = sqlite3.connect(database_file)
-    cursor = conn.cursor()
-
-    # Execute a SELECT query to fetch all rows from the specified table
-    cursor.execute(f"SELECT * FROM {table_name}")
-    rows = cursor.fetchall()
-
-    # Get the column names from the cursor description
-    column_names = [desc[0] for desc in cursor.description]
-
-    # Write the data to the CSV file
-    with open(csv_file, 'w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow(column_names)  # Write the column names as the first row
-        writer.writerows(rows)  # Write the data rows
-
-    # Close the connections
-    cursor.close()
-    conn.close()
-
-convert_sqlite_to_csv(DATABASE_FILE, TABLE_NAME, OUTPUT_FILENAME)
\ No newline at end of file
+import sqlite3
+import csv
+
+from working_ import OUTPUT_PATH
+import rewards_db
+
+# Usage example:
+DATABASE_FILE = 'new_projects.db'
+TABLE_NAME = 'projects'
+OUTPUT_FILENAME = 'output_db.csv'
+# Set to True to export projects with one column per reward field (rd_title_0, rd_title_1, ...)
+# like older databases. Rewards are otherwise only in the rewards table.
+WIDE = True
+
+
+def convert_sqlite_to_csv(database_file, table_name, csv_file, wide=False):
+    # Connect to the SQLite database
+    conn = sqlite3.connect(database_file)
+    cursor = conn.cursor()
+
+    # Join the rewards of each project back into columns.
+    if wide:
+        rewards_db.create_wide_view(conn, table_name)
+        table_name = rewards_db.WIDE_VIEW
+
+    # Execute a SELECT query to fetch all rows from the specified table
+    cursor.execute(f"SELECT * FROM {table_name}")
+    rows = cursor.fetchall()
+
+    # Get the column names from the cursor description
+    column_names = [desc[0] for desc in cursor.description]
+
+    # Write the data to the CSV file
+    with open(csv_file, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(column_names)  # Write the column names as the first row
+        writer.writerows(rows)  # Write the data rows
+
+    # Close the connections
+    cursor.close()
+    conn.close()
+
+convert_sqlite_to_csv(DATABASE_FILE, TABLE_NAME, OUTPUT_FILENAME, WIDE)
\ No newline at end of file
@@ -0,0 +1,202 @@
+import contextlib
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+
+# Settings.
+
+# Commit after this many writes or this many seconds after the first uncommitted write,
+# whichever comes first.
+BATCH_SIZE = 200
+BATCH_SECONDS = 5
+# Maximum number of writes waiting in the queue. Workers block on write when it is full.
+QUEUE_SIZE = 10000
+
+
+# Script.
+
+# Queue of the writer in this process. Set by DBWriter.start in the main process and by
+# init_worker in pool workers.
+_queue = None
+# Writes collected by capture in the current thread instead of being sent to the writer.
+_local = threading.local()
+# DBWriter started in this process, which paused holds.
+_writer = None
+# Message asking the writer to commit and wait, see DBWriter.paused.
+_FLUSH = "flush"
+
+
+class DBWriter:
+    """
+    A single process which owns the database connection and applies writes sent by
+    the main process and pool workers through a queue.
+
+    The connection is in WAL mode and commits in batches of batch_size writes or every
+    batch_seconds, so workers never wait on the database lock or an fsync per row.
+    Statements are prepared once per connection by sqlite3's statement cache. The process
+    which started the writer writes to the database itself in paused blocks, e.g. to lease
+    jobs, so it doesn't wait up to batch_seconds for the writer's transaction.
+
+    connect [callable] - Returns a sqlite3 connection with the tables created, e.g.
+    create_new_projects_db. Called once in the writer process with connect_args.
+    connect_args [tuple] - Arguments of connect.
+    batch_size [int] - Writes per commit. BATCH_SIZE by default.
+    batch_seconds [float] - Maximum seconds a write stays uncommitted. BATCH_SECONDS by default.
+    """
+
+    def __init__(self, connect, *connect_args, batch_size=BATCH_SIZE, batch_seconds=BATCH_SECONDS):
+        self.queue = multiprocessing.Queue(QUEUE_SIZE)
+        # Set by the writer once it committed for paused, and by paused once the block ended.
+        self.flushed = multiprocessing.Event()
+        self.resumed = multiprocessing.Event()
+        self.lock = threading.Lock()
+        self.process = multiprocessing.Process(target=run_writer, daemon=True,
+                                               args=(self.queue, connect, connect_args, batch_size, batch_seconds,
+                                                     self.flushed, self.resumed))
+
+    def start(self):
+        """Starts the writer process and lets write be called from this process."""
+        global _queue, _writer
+        self.process.start()
+        _queue = self.queue
+        _writer = self
+        return self
+
+    def close(self):
+        """Commits every queued write and stops the writer process."""
+        global _writer
+        if _writer is self:
+            _writer = None
+        self.queue.put(None)
+        self.process.join()
+
+    @contextlib.contextmanager
+    def paused(self):
+        """Has the writer commit the writes queued so far and wait until the with block ends, so
+        the block can write to the database without waiting for the writer's transaction. Threads
+        of this process take turns."""
+        with self.lock:
+            self.queue.put(_FLUSH)
+            while not self.flushed.wait(1):
+                if not self.process.is_alive():
+                    raise RuntimeError("The database writer stopped.")
+            self.flushed.clear()
+            try:
+                yield
+            finally:
+                self.resumed.set()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def init_worker(writer_queue):
+    """Pool initializer which lets write be called from pool workers.
+
+    writer_queue [multiprocessing.Queue] - DBWriter.queue."""
+    global _queue
+    _queue = writer_queue
+
+
+def paused():
+    """Returns DBWriter.paused of the writer started in this process, or a context which does
+    nothing in processes without one."""
+    return contextlib.nullcontext() if _writer is None else _writer.paused()
+
+
+def write(handler, *args):
+    """Sends a write to the writer process. handler is called there as handler(cur, *args)
+    and must be a module level function so it can be pickled.
+
+    handler [callable] - Executes the statements of the write with the given cursor.
+    args - Picklable arguments of handler."""
+    writes = getattr(_local, "writes", None)
+    if writes is not None:
+        writes.append((handler, args))
+        return
+    _queue.put([(handler, args)])
+
+
+def write_all(writes):
+    """Sends writes which are applied together or not at all. If a handler raises, the writes
+    before it are rolled back and the ones after it are skipped.
+
+    writes [list] - (handler, args) of each write, e.g. collected by capture."""
+    _queue.put(list(writes))
+
+
+@contextlib.contextmanager
+def capture():
+    """Collects the (handler, args) of every write made by this thread in the with block into
+    the yielded list instead of sending them to the writer process, e.g. to send them with
+    write_all once they all succeeded or to a coordinator on another machine."""
+    writes = []
+    _local.writes = writes
+    try:
+        yield writes
+    finally:
+        _local.writes = None
+
+
+def run_writer(writer_queue, connect, connect_args, batch_size, batch_seconds, flushed, resumed):
+    """Main loop of the writer process."""
+    con = connect(*connect_args)
+    # Transactions are begun and committed here instead of by sqlite3.
+    con.isolation_level = None
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    cur = con.cursor()
+
+    pending = 0
+    deadline = None
+    while True:
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            item = writer_queue.get(timeout=timeout)
+        except queue.Empty:
+            item = ()
+
+        if item == _FLUSH:
+            # Commit now and let the process which asked have the database until it's done.
+            if con.in_transaction:
+                cur.execute("COMMIT")
+                pending = 0
+                deadline = None
+            flushed.set()
+            resumed.wait()
+            resumed.clear()
+            continue
+
+        if item:
+            if not con.in_transaction:
+                cur.execute("BEGIN")
+                deadline = time.monotonic() + batch_seconds
+            # The writes of an item are rolled back together without losing the rest of the batch.
+            cur.execute("SAVEPOINT item")
+            for handler, args in item:
+                try:
+                    handler(cur, *args)
+                except Exception:
+                    logging.error(f"Exception in {handler.__name__}, rolling back {len(item)} writes\n"
+                                  f"{traceback.format_exc()}")
+                    cur.execute("ROLLBACK TO item")
+                    break
+            cur.execute("RELEASE item")
+            pending += len(item)
+
+        # Commit a full batch, an old batch or everything left on close.
+        if con.in_transaction and (item is None or pending >= batch_size or time.monotonic() >= deadline):
+            cur.execute("COMMIT")
+            pending = 0
+            deadline = None
+
+        if item is None:
+            break
+
+    con.close()
@@ -0,0 +1,171 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from multiprocessing import util
+
+# Settings.
+
+# Number of leases (usually one page each) a driver serves before it is quit and
+# replaced with a fresh one.
+MAX_PAGES = 50
+
+
+# Script.
+
+class DriverPoolTimeout(Exception):
+    """Exception raised when no driver could be leased from the pool in time."""
+
+    def __init__(self, message="Timed out waiting for a free driver"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class DriverPool:
+    """
+    A fixed set of warm webdrivers which are leased and returned instead of
+    launching a new browser for every page.
+
+    Drivers are created lazily by factory, health-checked before they are leased
+    and recycled (quit and replaced on the next lease) after max_pages pages or
+    when the caller asks for it, e.g. after a captcha.
+
+    factory [callable] - Returns a new webdriver. Called with no arguments.
+    size [int] - Maximum number of drivers alive at the same time. 1 by default.
+    max_pages [int] - Pages a driver serves before it is recycled. MAX_PAGES by default.
+    """
+
+    def __init__(self, factory, size=1, max_pages=MAX_PAGES):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.created = 0
+        self.recycled = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pages = {}
+        self._forward = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Returns a healthy driver from the pool, creating one if none are idle.
+        Blocks while all size drivers are leased. Raises DriverPoolTimeout if timeout
+        (seconds) passes first."""
+        if not self._slots.acquire(timeout=timeout):
+            raise DriverPoolTimeout()
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if is_healthy(driver):
+                    return driver
+                logging.info("Discarding unresponsive driver...")
+                self._discard(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, recycle=False, pages=1):
+        """Returns a leased driver to the pool. The driver given by acquire can be passed
+        even if it was swapped with replace during the lease.
+
+        driver [selenium webdriver] - A driver from acquire.
+        recycle [bool] - True to quit the driver instead of reusing it, e.g. after a captcha.
+        pages [int] - Number of pages loaded with the driver during this lease. 1 by default."""
+        with self._lock:
+            while id(driver) in self._forward:
+                driver = self._forward.pop(id(driver))[1]
+            for key in [key for key, (_, new) in self._forward.items() if new is driver]:
+                del self._forward[key]
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + pages
+            worn_out = self._pages[id(driver)] >= self.max_pages
+        if recycle or worn_out:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+        self._slots.release()
+
+    def replace(self, driver):
+        """Quits a leased driver and returns a fresh one without giving up the lease.
+        Used when a page has to be retried on a new browser, e.g. on captcha."""
+        self._discard(driver)
+        new_driver = self._create()
+        with self._lock:
+            # Keep the old driver referenced so its id isn't reused before release.
+            self._forward[id(driver)] = (driver, new_driver)
+        return new_driver
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Context manager which acquires a driver and releases it on exit. The driver
+        is recycled if the block raises since its state is unknown."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, recycle=True)
+            raise
+        else:
+            self.release(driver)
+
+    def recycle_all(self):
+        """Quits every idle driver so the next leases get fresh browsers."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def close(self):
+        """Quits every idle driver. Leased drivers are quit when they are released."""
+        self.max_pages = 0
+        self.recycle_all()
+
+    def _create(self):
+        driver = self.factory()
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self.created += 1
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self.recycled += 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.info(f"Error quitting driver: {e}")
+
+
+def is_healthy(driver):
+    """Returns True if the driver's browser still responds and False otherwise."""
+    try:
+        driver.window_handles
+    except Exception:
+        return False
+    return True
+
+
+# Pools of the current process keyed by factory so every script and worker
+# process keeps its own warm drivers.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(factory, size=1, max_pages=MAX_PAGES):
+    """Returns the current process's DriverPool for factory, creating it on first use.
+    The pool is closed when the process (including a multiprocessing worker) exits.
+
+    factory [callable] - Returns a new webdriver.
+    size [int] - Number of drivers in the pool. 1 by default.
+    max_pages [int] - Pages a driver serves before it is recycled. MAX_PAGES by default."""
+    with _pools_lock:
+        pool = _pools.get(factory)
+        if pool is None:
+            pool = _pools[factory] = DriverPool(factory, size, max_pages)
+            util.Finalize(pool, pool.close, exitpriority=10)
+    return pool
@@ -1,366 +1,451 @@
-import re
-import time
-from datetime import datetime
-import json
-import random
-import logging
-import os
-import winsound
-import threading
-import sqlite3
-import traceback
-
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-
-import pyautogui
-from bs4 import BeautifulSoup
-
-# Location of json with creator ids.
-CREATOR_ID_PATH = r'D:\unscraped_creators_0.json'
-# Location of json with already scraped project links.
-EXISTING_LINKS_PATH = r'D:\kickstarter_existing_links.json' 
-# Output file path.
-OUTPUT_PATH = r"D:"
-# Chromedriver path
-CHROMEDRIVER_PATH = r"C:\Users\jaber\OneDrive\Desktop\Research_JaberChowdhury\Kickstarter-Data-Scraper\chromedriver.exe"
-# Proton vpn windows taskbar location.
-icon_num = 5 
-
-# Number of threads per try.
-chunk_size = 5
-# Set logging. 
-logging.getLogger('uc').setLevel(logging.ERROR)
-logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO, datefmt='%m/%d/%Y %I:%M:%S %p')
-# Pyautogui settings.
-pyautogui.PAUSE = 1
-pyautogui.FAILSAFE = True
-
-def main():
-    global results, drivers
-
-    results = []
-    click_random(icon_num, False)
-    logging.info("Creating driver instances...")
-    drivers = [uc.Chrome(driver_executable_path=CHROMEDRIVER_PATH, headless=True) for i in range(chunk_size)]
-
-    # Get connection to database file.
-    con = create_project_db(OUTPUT_PATH)
-    cur = con.cursor()
-
-    # Get new creator ids.
-    with open(CREATOR_ID_PATH, "r") as f_obj:
-        new_creator_ids = json.load(f_obj)
-
-    # Get already scraped projects.
-    extracted = set(int(cid[0]) for cid in cur.execute("SELECT creator_id FROM projects;"))
-
-    # Get deleted creators.
-    deleted = set(int(cid[0]) for cid in cur.execute("SELECT creator_id FROM deleted_creators;"))
-    
-    skip = extracted | deleted
-    creator_ids = [creator_id for creator_id in new_creator_ids if creator_id not in skip]
-
-    total = 0
-    for i in range(0, len(creator_ids), chunk_size):
-        # Retry after changing server in case of errors.
-        while True:
-            results.clear()
-            threads = []
-            try:
-                for j, creator_id in enumerate(creator_ids[i:i + chunk_size]):
-                    thread = threading.Thread(target=extract_creator_data, args=(creator_id, j))
-                    thread.start()
-                    threads.append(thread)
-                for thread in threads:
-                    thread.join()
-            except Exception:
-                logging.info(f"\nException -\n {traceback.format_exc()} \nRetrying...")
-                winsound.Beep(440, 1000)
-                click_random(icon_num)
-            else:
-                break
-
-        # Write results
-        for creator_id, created_projects in results:
-            if created_projects:
-                cur.executemany("INSERT OR IGNORE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [tuple(project.values()) for project in created_projects])
-            else:
-                cur.execute("INSERT OR IGNORE INTO deleted_creators VALUES (?)", (creator_id,))
-        con.commit()                
-
-        # Change server after scraping a certain amount to not be blocked by kickstarter. Also refresh drivers
-        # to obfuscate bot detection.
-        total += chunk_size
-        if total % (chunk_size * 4) == 0:
-            logging.info("Changing server...\n")
-            click_random(icon_num, False)
-
-            for driver in drivers:
-                driver.quit()
-            
-            drivers = [uc.Chrome(driver_executable_path=CHROMEDRIVER_PATH, headless=True) for i in range(chunk_size)]
-
-def create_project_db(path):
-    """
-    Creates projects.db in path and returns a connection.
-    
-    path[str] - Location to save/load 'projects.db'
-    """
-    con = sqlite3.connect(os.path.join(path, "projects.db"))
-    cur = con.cursor()
-
-    # Table for project data.
-    cur.execute("""CREATE TABLE IF NOT EXISTS projects(
-                name TEXT,
-                url TEXT UNIQUE,
-                creator_id TEXT,
-                blurb TEXT,
-                original_currency TEXT,
-                converted_currency TEXT,
-                conversion_rate REAL,
-                goal REAL,
-                pledged REAL,
-                backers INTEGER,
-                state TEXT,
-                pwl INTEGER,
-                location TEXT,
-                subcategory TEXT,
-                category TEXT,
-                created_date TEXT,
-                launched_date TEXT,
-                deadline_date TEXT
-                    )""")
-    
-    # Table for deleted creators.
-    cur.execute("""CREATE TABLE IF NOT EXISTS deleted_creators(
-                creator_id TEXT UNIQUE
-    )
-        """)
-
-    # Table for previously extracted project urls.
-    cur.execute("""CREATE TABLE IF NOT EXISTS previous_projects(
-                url TEXT UNIQUE
-                )""")
-    
-    with open(EXISTING_LINKS_PATH) as f_obj:
-        new_creator_ids = json.load(f_obj)
-
-    for creator_id in new_creator_ids:
-        cur.execute("INSERT OR IGNORE INTO previous_projects VALUES (?)", (creator_id,))
-
-    con.commit()
-    return con
-
-def click_random(icon_num, wait=True):
-    """
-    Clicks random button in proton vpn. Proton VPN needs
-    to be open on the profiles page. 
-    
-    icon_num [int] - Index of proton vpn icon on the windows taskbar.
-    wait [bool] - If True, function will sleep for 10s to make sure Proton Vpn
-    connects and otherwise it will not sleep. True by default.
-    """
-    pyautogui.hotkey('win', str(icon_num))
-    pyautogui.click(333, 563, clicks=3, interval=0.15)
-    time.sleep(2)
-    pyautogui.hotkey('alt', 'tab')
-    if wait:
-        time.sleep(10)
-
-def get_digits(string, conv="float"):
-    """
-    Returns only digits from string as a single int/float. Default
-    is float. Returns empty string if no digit found.
-
-    Inputs: 
-    string[str] - Any string.
-    conv[str] - Enter "float" if you need float. Otherwise will provide integer. "float" by default.
-    """
-    if conv == "float":
-        res = re.findall(r'[0-9.]+', string)
-        if res == "":
-            return ""
-        return float("".join(res))
-    else:
-        res = re.findall(r'\d+', string)
-        if res == "":
-            return ""
-        return int("".join(res))
-    
-def get_live_soup(link, scroll=False, given_driver=None):
-    """
-    Returns a bs4 soup object of the given link. Returns None if it is a deleted kickstarter account.
-    
-    link [str] - A link to a website.
-    scroll [bool] - True if you want selenium to keep scrolling down till loading no longer happens.
-    False by default.
-    given_driver [selenium webdriver] - A webdriver. None by default.
-    """
-    if given_driver == None:
-        driver = uc.Chrome(executable_path=CHROMEDRIVER_PATH, headless=True)
-    else:
-        driver = given_driver
-    driver.get(link)
-
-    soup = BeautifulSoup(driver.page_source, "lxml")
-
-    # If there is a capcha, raise an exception.
-    capcha_elem = soup.select_one('div[id="px-captcha"]')
-    if capcha_elem != None:
-        raise Exception("Captcha encountered.")
-    
-    # If it is a deleted account or there is a 404 error, return.
-    deleted_elem = soup.select_one('div[class="center"]')
-    non_existent_elem = soup.select_one('a[href="/?ref=404-ksr10"]')
-    if deleted_elem != None or non_existent_elem != None:
-        if given_driver == None:
-            driver.quit()
-        return
-    
-    if scroll:
-        scroll_num = 1
-        while True:
-            # Scroll down to bottom
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-
-            # Wait to scroll. Notify if unusually high number of scrolls (which may mean that
-            # there is a 403 error).
-            if scroll_num % 60 == 0:
-                winsound.Beep(440, 1000)
-
-            if scroll_num % 30 == 0:
-                time.sleep(30)
-            else:
-                time.sleep(random.uniform(1, 2))
-
-            scroll_num += 1
-
-            # Stop scrolling if no longer loading.
-            try:
-                elem = driver.find_element(By.CSS_SELECTOR, 'li[data-last_page="true"]')
-            except:
-                continue
-            else:
-                break
-
-    soup = BeautifulSoup(driver.page_source, "lxml")
-
-    if given_driver == None:
-        driver.quit()
-
-    return soup
-
-def extract_elem_text(soup, selector):
-    """
-    Returns resulting text of using given selector in soup.
-    If there was no text, returns empty string. 
-    
-    Inputs:
-    soup[bs4.BeautifulSoup] - A soup.
-    selector[str] - A css selector.
-    """
-    elem = soup.select_one(selector)
-    if elem == None:
-        return ""
-    else:
-        return elem.getText()
-
-def parse_data_project(data_project):
-    """
-    Parses a kickstarter data project dictionary and returns a dictionary of
-    required keys.
-    
-    data-project [dict]- A kickstarter data project dict.
-    """
-    result = {}
-
-    result['name'] = data_project['name']
-    url = data_project['urls']['web']['project']
-
-    result['url'] = url
-    result['creator_id'] = data_project['creator']['id']
-    result['blurb'] = data_project['blurb']
-
-    # Convert currencies to USD.
-    result['original_currency'] = data_project['currency']
-    result['converted_currency'] = 'USD'
-    result['conversion_rate'] = data_project['static_usd_rate']
-    result['goal'] = data_project['goal'] * data_project['static_usd_rate']
-    result['pledged'] = data_project['usd_pledged']
-
-    result['backers'] = data_project['backers_count']
-    result['state'] = data_project['state'].title()
-    result['pwl'] = int(data_project['staff_pick'])
-    result['location'] = data_project.get('location', {}).get('short_name', "")
-
-    if 'parent_name' in data_project['category']:
-        result['subcategory'] = data_project['category']['name']
-        result['category'] = data_project['category']['parent_name']
-    else:
-        result['subcategory'] = ""
-        result['category'] = data_project['category']['name']
-
-    result['created_date'] = datetime.fromtimestamp(data_project['created_at']).strftime('%Y-%m-%d')
-    result['launched_date'] = datetime.fromtimestamp(data_project['launched_at']).strftime('%Y-%m-%d')
-    result['deadline_date'] = datetime.fromtimestamp(data_project['deadline']).strftime('%Y-%m-%d')
-
-    return result
-
-def extract_creator_data(creator_id, index=None):
-    """
-    Returns a dictionary of the data for the creator. Returns None in case of a deleted account.
-    Can load a webdriver from the given index from the global list drivers (optional).
-    
-    creator_id [str/int] - A kickstarter creator id.
-    index [int] - Index of webdriver in drivers for this function call.
-    """
-    logging.info(f"Started extracting {creator_id} data...")
-    path = r"https://www.kickstarter.com/profile/" + str(creator_id)
-
-    if index == None:
-        driver = uc.Chrome(executable_path=CHROMEDRIVER_PATH, headless=True)
-    else:
-        driver = drivers[index]
-    # Extract data from available pages. There may be multiple pages for created projects.
-
-    try:
-        created_soup = get_live_soup(path + "/created", given_driver=driver)
-    except Exception as e:
-        if index == None:
-            driver.quit()
-        raise e
-
-    if created_soup == None:
-        return (creator_id, [])
-    
-    created_soups = [created_soup]
-    while True:
-        next_elem = created_soup.select_one('a[rel="next"]')
-
-        # No further pages.
-        if next_elem == None:
-            break   
-        
-        created_soup = get_live_soup("https://www.kickstarter.com/" + next_elem['href'], given_driver=driver)
-        created_soups.append(created_soup)
-
-    if index == None:
-        driver.quit()          
-
-    # Created projects.
-    created_data_projects = []
-    for created_soup in created_soups:
-        created_project_elem = created_soup.select_one('div[data-projects]')
-        created_data_projects.extend(json.loads(created_project_elem['data-projects']))
-
-    created_projects = []
-    for created_data_project in created_data_projects:
-        parsed = parse_data_project(created_data_project)
-        if parsed != None:
-            created_projects.append(parsed)
-
-    results.append((creator_id, created_projects))
-
-if __name__ == "__main__":
-    main()
+import re
+import time
+from datetime import datetime
+import json
+import logging
+import os
+import winsound
+import sqlite3
+from multiprocessing.pool import ThreadPool
+
+import undetected_chromedriver as uc
+
+import pyautogui
+from bs4 import BeautifulSoup
+
+from driver_pool import get_driver_pool
+import http_fetcher
+from page_cache import get_page_cache
+import db_writer
+import job_queue
+import coordinator
+import rate_control
+import egress
+import resource_filter
+import page_waits
+
+# Location of json with creator ids.
+CREATOR_ID_PATH = r'D:\unscraped_creators_0.json'
+# Location of json with already scraped project links.
+EXISTING_LINKS_PATH = r'D:\kickstarter_existing_links.json' 
+# Output file path.
+OUTPUT_PATH = r"D:"
+# Folder of the raw page cache. Pages are only fetched live if they aren't cached or are stale.
+CACHE_PATH = os.path.join(OUTPUT_PATH, "page_cache")
+# Seconds after which a cached page is fetched again. None to never fetch cached pages again.
+CACHE_MAX_AGE = None
+# Chromedriver path
+CHROMEDRIVER_PATH = r"C:\Users\jaber\OneDrive\Desktop\Research_JaberChowdhury\Kickstarter-Data-Scraper\chromedriver.exe"
+# Proton vpn windows taskbar location.
+icon_num = 5 
+# Set to True to fetch pages over plain HTTP first and only use a browser when needed.
+HTTP_FIRST = True
+# Set to "coordinator" to hand out the creators to worker nodes and merge their results into projects.db,
+# "node" to extract creators for the coordinator at COORDINATOR_URL or "local" to extract on this machine only.
+ROLE = "local"
+# Address of the coordinator for "node". Defaults to one on this machine. Set to
+# "http://<coordinator's ip>:8765" for a coordinator on another machine.
+COORDINATOR_URL = f"http://127.0.0.1:{coordinator.PORT}"
+
+# Number of creators being extracted at a time, each by its own thread and browser.
+chunk_size = 5
+# Set logging. 
+logging.getLogger('uc').setLevel(logging.ERROR)
+logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO, datefmt='%m/%d/%Y %I:%M:%S %p')
+# Pyautogui settings.
+pyautogui.PAUSE = 1
+pyautogui.FAILSAFE = True
+# Change server whenever the rate controller keeps getting blocked.
+rate_control.get_rate_controller().on_rotate = lambda: change_server()
+
+def main():
+    global driver_pool
+
+    click_random(icon_num, False)
+    # One warm driver per thread. Drivers are created on first lease.
+    driver_pool = get_driver_pool(create_driver, size=chunk_size)
+
+    # Creators waiting to be extracted. Creators left leased by a crashed run are extracted again.
+    creator_ids = get_creator_ids()
+    jobs = job_queue.JobQueue(os.path.join(OUTPUT_PATH, "projects.db"), "extra_projects")
+    jobs.release_own()
+    jobs.add((str(creator_id), (creator_id,)) for creator_id in creator_ids)
+
+    # Only the writer process touches the database. Threads send it their results.
+    writer = db_writer.DBWriter(create_project_db, OUTPUT_PATH).start()
+    run_creators(jobs)
+    jobs.close()
+    writer.close()
+
+def main_coordinator():
+    """Hands out the creators of CREATOR_ID_PATH which aren't extracted yet to worker nodes and
+    merges their results into projects.db once every creator is done. See coordinator.serve."""
+    coordinator.serve(os.path.join(OUTPUT_PATH, "projects.db"), "extra_projects",
+                      ((str(creator_id), (creator_id,)) for creator_id in get_creator_ids()),
+                      {"write_created_projects": write_created_projects})
+
+def main_node():
+    """Extracts creators leased from the coordinator at COORDINATOR_URL and sends the results
+    back to it instead of writing them to projects.db."""
+    global driver_pool
+
+    click_random(icon_num, False)
+    driver_pool = get_driver_pool(create_driver, size=chunk_size)
+
+    jobs = coordinator.RemoteJobQueue(COORDINATOR_URL, "extra_projects")
+    jobs.release_own()
+    run_creators(jobs)
+
+def run_creators(jobs):
+    """Extracts the creators of jobs with chunk_size threads. Failed creators are retried by the
+    queue up to job_queue.MAX_ATTEMPTS times."""
+    pool = ThreadPool(chunk_size)
+
+    def on_finish(creator_id, error):
+        # Blocked creators are quarantined and retried later without help.
+        if error is not None and not isinstance(error, job_queue.Blocked):
+            winsound.Beep(440, 1000)
+
+    # The threads share the rate controller of the process, which paces their requests and
+    # changes server when they keep getting blocked.
+    job_queue.run_jobs(pool, jobs, extract_write, chunk_size, on_finish=on_finish)
+
+    pool.close()
+    pool.join()
+
+def get_creator_ids():
+    """Returns creator ids from CREATOR_ID_PATH which aren't already extracted or deleted."""
+    # Get connection to database file.
+    con = create_project_db(OUTPUT_PATH)
+    cur = con.cursor()
+
+    # Get new creator ids.
+    with open(CREATOR_ID_PATH, "r") as f_obj:
+        new_creator_ids = json.load(f_obj)
+
+    # Get already scraped projects.
+    extracted = set(int(cid[0]) for cid in cur.execute("SELECT creator_id FROM projects;"))
+
+    # Get deleted creators.
+    deleted = set(int(cid[0]) for cid in cur.execute("SELECT creator_id FROM deleted_creators;"))
+    con.close()
+
+    skip = extracted | deleted
+    return [creator_id for creator_id in new_creator_ids if creator_id not in skip]
+
+def create_project_db(path):
+    """
+    Creates projects.db in path and returns a connection.
+    
+    path[str] - Location to save/load 'projects.db'
+    """
+    con = sqlite3.connect(os.path.join(path, "projects.db"))
+    cur = con.cursor()
+
+    # Table for project data.
+    cur.execute("""CREATE TABLE IF NOT EXISTS projects(
+                name TEXT,
+                url TEXT UNIQUE,
+                creator_id TEXT,
+                blurb TEXT,
+                original_currency TEXT,
+                converted_currency TEXT,
+                conversion_rate REAL,
+                goal REAL,
+                pledged REAL,
+                backers INTEGER,
+                state TEXT,
+                pwl INTEGER,
+                location TEXT,
+                subcategory TEXT,
+                category TEXT,
+                created_date TEXT,
+                launched_date TEXT,
+                deadline_date TEXT
+                    )""")
+    
+    # Table for deleted creators.
+    cur.execute("""CREATE TABLE IF NOT EXISTS deleted_creators(
+                creator_id TEXT UNIQUE
+    )
+        """)
+
+    # Table for previously extracted project urls.
+    cur.execute("""CREATE TABLE IF NOT EXISTS previous_projects(
+                url TEXT UNIQUE
+                )""")
+    
+    with open(EXISTING_LINKS_PATH) as f_obj:
+        new_creator_ids = json.load(f_obj)
+
+    for creator_id in new_creator_ids:
+        cur.execute("INSERT OR IGNORE INTO previous_projects VALUES (?)", (creator_id,))
+
+    # Creators waiting to be extracted and results of worker nodes waiting to be merged.
+    job_queue.create_jobs_table(cur)
+    coordinator.create_results_table(cur)
+
+    con.commit()
+    return con
+
+def click_random(icon_num, wait=True):
+    """
+    Clicks random button in proton vpn. Proton VPN needs
+    to be open on the profiles page. 
+    
+    icon_num [int] - Index of proton vpn icon on the windows taskbar.
+    wait [bool] - If True, function will sleep for 10s to make sure Proton Vpn
+    connects and otherwise it will not sleep. True by default.
+    Does nothing if egress.PROXIES are set.
+    """
+    if egress.PROXIES:
+        # Proxies are rotated by egress instead.
+        return
+    pyautogui.hotkey('win', str(icon_num))
+    pyautogui.click(333, 563, clicks=3, interval=0.15)
+    time.sleep(2)
+    pyautogui.hotkey('alt', 'tab')
+    if wait:
+        time.sleep(10)
+
+def change_server():
+    """Changes server and quits the idle drivers so the next pages are loaded by fresh
+    browsers to obfuscate bot detection."""
+    logging.info("Changing server...\n")
+    click_random(icon_num, False)
+    driver_pool.recycle_all()
+
+def create_driver():
+    """
+    Returns a new headless undetected chrome webdriver which goes out through the next proxy
+    of egress.PROXIES, if any. Used by the driver pool.
+    """
+    chrome_options = uc.ChromeOptions()
+    endpoint = egress.next_endpoint()
+    if endpoint is not None:
+        chrome_options.add_argument(f"--proxy-server={endpoint.server}")
+    driver = uc.Chrome(options=chrome_options, driver_executable_path=CHROMEDRIVER_PATH, headless=True)
+    # The driver keeps its proxy until it is quit.
+    driver.egress = endpoint
+    # Pages are only parsed, so media, fonts and trackers aren't loaded.
+    return resource_filter.block_resources(driver)
+
+def get_digits(string, conv="float"):
+    """
+    Returns only digits from string as a single int/float. Default
+    is float. Returns empty string if no digit found.
+
+    Inputs: 
+    string[str] - Any string.
+    conv[str] - Enter "float" if you need float. Otherwise will provide integer. "float" by default.
+    """
+    if conv == "float":
+        res = re.findall(r'[0-9.]+', string)
+        if res == "":
+            return ""
+        return float("".join(res))
+    else:
+        res = re.findall(r'\d+', string)
+        if res == "":
+            return ""
+        return int("".join(res))
+    
+def get_live_soup(link, scroll=False, given_driver=None, required=None):
+    """
+    Returns a bs4 soup object of the given link. Returns None if it is a deleted kickstarter account.
+    
+    link [str] - A link to a website.
+    scroll [bool] - True if you want selenium to keep scrolling down till loading no longer happens.
+    False by default.
+    given_driver [selenium webdriver] - A webdriver. None by default.
+    required [tuple] - Markers of embedded json. If given, the page is fetched over plain HTTP first
+    and the browser is only used if a marker is missing or there is a captcha. None by default.
+    """
+    cache = get_page_cache(CACHE_PATH)
+    html = cache.get(link, CACHE_MAX_AGE)
+    if html == None and HTTP_FIRST and not scroll and required != None:
+        html = http_fetcher.get_html(link, required, http_fetcher.MISSING_MARKERS)
+        if html != None:
+            cache.put(link, html)
+    if html != None:
+        soup = BeautifulSoup(html, "lxml")
+        # Deleted account or 404 error.
+        if soup.select_one('div[class="center"]') != None or soup.select_one('a[href="/?ref=404-ksr10"]') != None:
+            return
+        return soup
+
+    if given_driver == None:
+        driver = create_driver()
+    else:
+        driver = given_driver
+    controller = rate_control.get_rate_controller()
+    controller.wait()
+    driver.get(link)
+
+    soup = BeautifulSoup(driver.page_source, "lxml")
+
+    # If there is a capcha, raise an exception.
+    capcha_elem = soup.select_one('div[id="px-captcha"]')
+    outcome = "captcha" if capcha_elem != None else rate_control.OK
+    controller.record(outcome)
+    # A blocked proxy cools down and the driver is recycled for one on another proxy.
+    egress.report(driver, outcome)
+    # Quarantine the creator so the thread moves on.
+    if capcha_elem != None:
+        if given_driver == None:
+            driver.quit()
+        raise job_queue.Blocked(outcome)
+    
+    # If it is a deleted account or there is a 404 error, return.
+    deleted_elem = soup.select_one('div[class="center"]')
+    non_existent_elem = soup.select_one('a[href="/?ref=404-ksr10"]')
+    if deleted_elem != None or non_existent_elem != None:
+        cache.put(link, str(soup))
+        if given_driver == None:
+            driver.quit()
+        return
+    
+    if scroll:
+        scroll_num = 1
+        while True:
+            # Notify if unusually high number of scrolls (which may mean that there is a 403 error).
+            if scroll_num % 60 == 0:
+                winsound.Beep(440, 1000)
+
+            if scroll_num % 30 == 0:
+                time.sleep(30)
+
+            scroll_num += 1
+
+            # Scroll down to bottom and wait for the next page of projects to load. Stop
+            # scrolling if no longer loading.
+            if page_waits.wait(driver, "backed", scroll=True) == page_waits.FOUND:
+                break
+
+    html = driver.page_source
+    soup = BeautifulSoup(html, "lxml")
+    cache.put(link, html)
+
+    if given_driver == None:
+        driver.quit()
+
+    return soup
+
+def extract_elem_text(soup, selector):
+    """
+    Returns resulting text of using given selector in soup.
+    If there was no text, returns empty string. 
+    
+    Inputs:
+    soup[bs4.BeautifulSoup] - A soup.
+    selector[str] - A css selector.
+    """
+    elem = soup.select_one(selector)
+    if elem == None:
+        return ""
+    else:
+        return elem.getText()
+
+def parse_data_project(data_project):
+    """
+    Parses a kickstarter data project dictionary and returns a dictionary of
+    required keys.
+    
+    data-project [dict]- A kickstarter data project dict.
+    """
+    result = {}
+
+    result['name'] = data_project['name']
+    url = data_project['urls']['web']['project']
+
+    result['url'] = url
+    result['creator_id'] = data_project['creator']['id']
+    result['blurb'] = data_project['blurb']
+
+    # Convert currencies to USD.
+    result['original_currency'] = data_project['currency']
+    result['converted_currency'] = 'USD'
+    result['conversion_rate'] = data_project['static_usd_rate']
+    result['goal'] = data_project['goal'] * data_project['static_usd_rate']
+    result['pledged'] = data_project['usd_pledged']
+
+    result['backers'] = data_project['backers_count']
+    result['state'] = data_project['state'].title()
+    result['pwl'] = int(data_project['staff_pick'])
+    result['location'] = data_project.get('location', {}).get('short_name', "")
+
+    if 'parent_name' in data_project['category']:
+        result['subcategory'] = data_project['category']['name']
+        result['category'] = data_project['category']['parent_name']
+    else:
+        result['subcategory'] = ""
+        result['category'] = data_project['category']['name']
+
+    result['created_date'] = datetime.fromtimestamp(data_project['created_at']).strftime('%Y-%m-%d')
+    result['launched_date'] = datetime.fromtimestamp(data_project['launched_at']).strftime('%Y-%m-%d')
+    result['deadline_date'] = datetime.fromtimestamp(data_project['deadline']).strftime('%Y-%m-%d')
+
+    return result
+
+def extract_creator_data(creator_id):
+    """
+    Returns the created projects of the creator as dicts. Returns an empty list in case of a deleted account.
+    Leases a webdriver from the driver pool for the duration of the call.
+    
+    creator_id [str/int] - A kickstarter creator id.
+    """
+    logging.info(f"Started extracting {creator_id} data...")
+    path = r"https://www.kickstarter.com/profile/" + str(creator_id)
+
+    # Extract data from available pages. There may be multiple pages for created projects.
+    # Driver is recycled by the pool if a captcha is encountered.
+    with get_driver_pool(create_driver, size=chunk_size).lease() as driver:
+        created_soup = get_live_soup(path + "/created", given_driver=driver, required=http_fetcher.CREATED_MARKERS)
+
+        if created_soup == None:
+            return []
+        
+        created_soups = [created_soup]
+        while True:
+            next_elem = created_soup.select_one('a[rel="next"]')
+
+            # No further pages.
+            if next_elem == None:
+                break   
+            
+            created_soup = get_live_soup("https://www.kickstarter.com/" + next_elem['href'], given_driver=driver, required=http_fetcher.CREATED_MARKERS)
+            created_soups.append(created_soup)
+
+    # Created projects.
+    created_data_projects = []
+    for created_soup in created_soups:
+        created_project_elem = created_soup.select_one('div[data-projects]')
+        created_data_projects.extend(json.loads(created_project_elem['data-projects']))
+
+    created_projects = []
+    for created_data_project in created_data_projects:
+        parsed = parse_data_project(created_data_project)
+        if parsed != None:
+            created_projects.append(parsed)
+
+    return created_projects
+
+def extract_write(creator_id):
+    """Extracts the created projects of a creator and sends them to the database writer."""
+    db_writer.write(write_created_projects, creator_id, extract_creator_data(creator_id))
+
+def write_created_projects(cur, creator_id, created_projects):
+    """Adds the created projects of a creator to the database or the creator to deleted_creators
+    if there are none. Runs in the database writer process."""
+    if created_projects:
+        cur.executemany("INSERT OR IGNORE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [tuple(project.values()) for project in created_projects])
+    else:
+        cur.execute("INSERT OR IGNORE INTO deleted_creators VALUES (?)", (creator_id,))
+
+if __name__ == "__main__":
+    if ROLE == "coordinator":
+        main_coordinator()
+    elif ROLE == "node":
+        main_node()
+    else:
+        main()
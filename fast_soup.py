@@ -0,0 +1,135 @@
+from lxml import etree, html
+from cssselect import HTMLTranslator
+from bs4 import BeautifulSoup
+
+# Settings.
+
+# Default engine. "lxml" for the lxml backed Node and "bs4" for BeautifulSoup.
+PARSER = "lxml"
+
+# Tags whose text BeautifulSoup leaves out of getText of their ancestors.
+SKIP_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+
+
+# Script.
+
+# Compiled selectors keyed by css. Compiling is slower than matching so it's done once.
+_selectors = {}
+_translator = HTMLTranslator()
+
+
+def parse_html(markup, parser=PARSER):
+    """Returns the soup of markup. With the "lxml" engine it is a Node, which supports the
+    subset of the bs4 api used by the extractors (select_one, select, getText, [attr], attrs
+    and contents) and gives the same results for the same css selectors.
+
+    markup [str] - Page source.
+    parser [str] - "lxml" (default) or "bs4"."""
+    if parser == "bs4":
+        return BeautifulSoup(markup, "lxml")
+
+    try:
+        root = html.document_fromstring(markup)
+    except ValueError:
+        # lxml refuses unicode strings with an xml encoding declaration.
+        root = html.document_fromstring(markup.encode("utf8"), parser=html.HTMLParser(encoding="utf8"))
+    except etree.ParserError:
+        # Empty document. bs4 gives an empty soup.
+        root = html.Element("html")
+    normalize_classes(root)
+    return Node(root)
+
+
+def normalize_classes(root):
+    """Collapses whitespace in class attributes like bs4 does, so selectors such as
+    div[class="a b"] match the same elements with both engines."""
+    for elem in root.iter():
+        classes = elem.get("class")
+        if classes is not None and " ".join(classes.split()) != classes:
+            elem.set("class", " ".join(classes.split()))
+
+
+def get_selector(css):
+    """Returns the compiled selector of css. Matches descendants only, like bs4's select."""
+    selector = _selectors.get(css)
+    if selector is None:
+        selector = _selectors[css] = etree.XPath(_translator.css_to_xpath(css, prefix="descendant::"))
+    return selector
+
+
+class Text(str):
+    """A text node in Node.contents. Behaves like bs4's NavigableString."""
+
+    def getText(self):
+        return str(self)
+
+    get_text = getText
+
+
+class Node:
+    """
+    Wrapper around an lxml element with the bs4 methods used by the extractors.
+
+    elem [lxml.html.HtmlElement] - Element to wrap.
+    """
+
+    __slots__ = ("elem",)
+
+    def __init__(self, elem):
+        self.elem = elem
+
+    def select_one(self, css):
+        """Returns the first element matching css or None."""
+        elems = get_selector(css)(self.elem)
+        return Node(elems[0]) if elems else None
+
+    def select(self, css):
+        """Returns a list of every element matching css."""
+        return [Node(elem) for elem in get_selector(css)(self.elem)]
+
+    def getText(self):
+        """Returns the text of the element and its descendants."""
+        return "".join(iter_text(self.elem))
+
+    get_text = getText
+
+    @property
+    def attrs(self):
+        return dict(self.elem.attrib)
+
+    @property
+    def contents(self):
+        """Returns the child elements and text nodes of the element in order."""
+        contents = []
+        if self.elem.text:
+            contents.append(Text(self.elem.text))
+        for child in self.elem:
+            if isinstance(child.tag, str):
+                contents.append(Node(child))
+            else:
+                # Comment. bs4 keeps it as a string.
+                contents.append(Text(child.text or ""))
+            if child.tail:
+                contents.append(Text(child.tail))
+        return contents
+
+    def get(self, key, default=None):
+        return self.elem.get(key, default)
+
+    def __getitem__(self, key):
+        value = self.elem.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+
+def iter_text(elem):
+    """Yields the text of elem and its descendants, skipping comments and the contents
+    of SKIP_TEXT_TAGS like bs4's getText."""
+    if elem.text:
+        yield elem.text
+    for child in elem:
+        if isinstance(child.tag, str) and child.tag not in SKIP_TEXT_TAGS:
+            yield from iter_text(child)
+        if child.tail:
+            yield child.tail
@@ -0,0 +1,165 @@
+import logging
+import threading
+from collections import Counter
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import egress
+import rate_control
+
+# Settings.
+
+# Seconds to wait for a response before escalating to the browser.
+TIMEOUT = 15
+# Number of keep-alive connections kept open per host.
+POOL_SIZE = 20
+# Log stats every LOG_EVERY pages.
+LOG_EVERY = 100
+# Headers sent with every request. requests decodes gzip/deflate responses itself.
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/124.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Substrings of pages which must be loaded in a browser instead.
+CAPTCHA_MARKERS = ('id="px-captcha"',)
+CHALLENGE_MARKERS = ('id="challenge-running"', 'id="challenge-form"')
+# Status codes which mean we are blocked or rate limited.
+BLOCKED_STATUSES = {403, 429, 503}
+
+# Markers of embedded json for each kind of page.
+CAMPAIGN_MARKERS = ("window.current_project", "data-initial=")
+REWARD_MARKERS = ("data-test-id=",)
+CREATED_MARKERS = ("data-projects=",)
+ABOUT_MARKERS = ('property="og:url"',)
+# Pages which are complete without json, e.g. hidden projects and deleted accounts. A tuple
+# matches when all of its substrings are in the page. The centered div of a deleted account's
+# notice is on other pages too, so it only counts together with the notice's text.
+HIDDEN_MARKERS = ('id="hidden_project"',)
+MISSING_MARKERS = ('href="/?ref=404-ksr10"', ('<div class="center">', "deleted"))
+
+
+# Script.
+
+# Number of pages served over HTTP and escalations to the browser by reason.
+stats = Counter()
+_stats_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Returns the current process's requests session, creating it on first use. The
+    session keeps pooled keep-alive connections to each host."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+    return _session
+
+
+def has_marker(html, marker):
+    """Returns True if marker, a substring or a tuple of substrings, is all in html."""
+    if isinstance(marker, tuple):
+        return all(part in html for part in marker)
+    return marker in html
+
+
+def needs_browser(status, html, required=(), accept=()):
+    """Returns the reason a fetched page has to be loaded in a browser or None
+    if the html can be used as is.
+
+    status [int] - HTTP status code.
+    html [str] - Page source.
+    required [tuple] - Substrings which must all be in html, e.g. markers of embedded json.
+    accept [tuple] - Markers which make html usable even if required markers are missing, see
+    has_marker."""
+    if any(marker in html for marker in CAPTCHA_MARKERS):
+        return "captcha"
+    if any(marker in html for marker in CHALLENGE_MARKERS):
+        return "challenge"
+    if status in BLOCKED_STATUSES:
+        return f"status_{status}"
+    if any(has_marker(html, marker) for marker in accept):
+        return None
+    if status != 200:
+        return f"status_{status}"
+    if not all(marker in html for marker in required):
+        return "missing_json"
+    return None
+
+
+def get_html(url, required=(), accept=()):
+    """Returns the html of url fetched over plain HTTP. Returns None if the page
+    has to be loaded in a browser instead because of a captcha, a challenge page, a
+    bad status or missing json. Each escalation is counted in stats.
+
+    url [str] - A link to a website.
+    required [tuple] - Substrings which must all be in the page, e.g. CAMPAIGN_MARKERS.
+    accept [tuple] - Markers which make the page usable as is, e.g. HIDDEN_MARKERS."""
+    controller = rate_control.get_rate_controller()
+    controller.wait()
+    # Goes out through the session's proxy if egress.PROXIES are set.
+    endpoint = egress.session_endpoint()
+    try:
+        response = get_session().get(url, timeout=TIMEOUT, proxies=endpoint and endpoint.proxies())
+    except requests.RequestException as e:
+        logging.info(f"HTTP fetch of {url} failed: {e}")
+        count("escalated_error")
+        controller.record(egress.ERROR)
+        if endpoint is not None:
+            endpoint.report(egress.ERROR)
+        return None
+
+    return check_page(url, response.status_code, response.text, required, accept, endpoint=endpoint)
+
+
+def check_page(url, status, html, required=(), accept=(), controller=None, endpoint=None):
+    """Returns html if it can be used as is and None if it has to be loaded in a browser.
+    Counts the page in stats and records its outcome with the rate controller and the proxy
+    endpoint either way. Shared by get_html and async_fetcher.
+
+    url [str] - Link of the page.
+    status [int] - HTTP status code.
+    html [str] - Page source.
+    required [tuple] - Substrings which must all be in the page.
+    accept [tuple] - Markers which make the page usable as is.
+    controller [rate_control.RateController] - The process's controller by default.
+    endpoint [egress.Endpoint] - Proxy the page was fetched through. None by default."""
+    reason = needs_browser(status, html, required, accept)
+    (controller or rate_control.get_rate_controller()).record(reason or rate_control.OK)
+    if endpoint is not None:
+        endpoint.report(reason or rate_control.OK)
+    if reason is not None:
+        logging.info(f"Escalating {url} to browser ({reason})...")
+        count("escalated_" + reason)
+        return None
+
+    count("http")
+    return html
+
+
+def count(key, n=1):
+    """Adds n to the stats counter key and logs stats every LOG_EVERY pages."""
+    with _stats_lock:
+        stats[key] += n
+        total = sum(stats.values())
+    if total % LOG_EVERY == 0:
+        log_stats()
+
+
+def log_stats():
+    """Logs number of pages served over HTTP, escalations by reason and the rate of the
+    process's rate controller."""
+    with _stats_lock:
+        escalated = sum(n for key, n in stats.items() if key.startswith("escalated_"))
+        logging.info(f"HTTP pages: {stats['http']}, escalated to browser: {escalated} {dict(stats)}")
+    rate_control.get_rate_controller().log_stats()
@@ -0,0 +1,323 @@
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import socket
+import sqlite3
+import tempfile
+import time
+
+import db_writer
+
+# Settings.
+
+# Seconds a leased job may run before another worker may lease it again.
+LEASE_SECONDS = 15 * 60
+# Number of leases after which a job which keeps failing or timing out is marked failed.
+MAX_ATTEMPTS = 3
+# Seconds to wait before looking again when every remaining job is leased by another worker
+# or quarantined.
+POLL_SECONDS = 10
+# Seconds a job whose page was blocked waits before it is leased again, by then on another
+# driver and, with rotation, another egress.
+QUARANTINE_SECONDS = 5 * 60
+# Number of quarantines after which a job whose page keeps being blocked is marked failed.
+MAX_QUARANTINES = 10
+
+
+# Script.
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+QUARANTINED = "quarantined"
+
+
+class Blocked(Exception):
+    """Exception raised by a job whose page was blocked, e.g. by a captcha. The job is
+    quarantined and retried later instead of being retried in the worker."""
+
+    def __init__(self, kind="captcha"):
+        self.kind = kind
+        super().__init__(f"Page is blocked by a {kind}.")
+
+    def __reduce__(self):
+        return (Blocked, (self.kind,))
+
+
+def create_jobs_table(cur):
+    """Creates the jobs table if it doesn't exist. Jobs of every queue in the database share it.
+
+    cur [sqlite3.Cursor] - Cursor of the database the results of the jobs are written to."""
+    cur.execute("""CREATE TABLE IF NOT EXISTS jobs(
+        queue TEXT,
+        key TEXT,
+        args TEXT,
+        state TEXT DEFAULT 'pending',
+        attempts INTEGER DEFAULT 0,
+        lease_until REAL,
+        worker TEXT,
+        error TEXT,
+        quarantines INTEGER DEFAULT 0,
+        PRIMARY KEY (queue, key)
+        )""")
+    cur.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs(queue, state, lease_until)")
+
+
+def mark_done(cur, queue_name, key):
+    """Marks a job done. Sent to the database writer together with the job's own writes so the
+    job is only done once its results are committed."""
+    cur.execute("UPDATE jobs SET state = ?, lease_until = NULL, error = NULL WHERE queue = ? AND key = ?",
+                (DONE, queue_name, key))
+
+
+def run_job(func, queue_name, remote, key, fixed_args, args):
+    """Runs a job in a pool worker and sends its writes to the database writer, or to the
+    coordinator if the queue is remote. The writes are only sent once the job finished, and
+    the writer marks the job done with them, so a job which raises or whose writes fail
+    leaves nothing behind and stays leased until it is retried."""
+    with db_writer.capture() as writes:
+        func(*fixed_args, *args)
+    if remote is None:
+        db_writer.write_all(writes + [(mark_done, (queue_name, key))])
+    else:
+        remote.done(key, writes)
+
+
+class JobQueue:
+    """
+    Persistent queue of jobs in a table of the results database. A job is pending until
+    a worker leases it, leased until it is done, fails or its lease expires, and failed once
+    it was leased max_attempts times without being done. A job whose page was blocked is
+    quarantined until it may be leased again, and failed once it was quarantined
+    max_quarantines times. A crash loses at most the jobs which were leased at the time, and
+    those are leased again on the next run.
+
+    database [str] - Path to the database. The jobs table must exist.
+    name [str] - Name of the queue, so scripts sharing a database don't share jobs.
+    lease_seconds [float] - LEASE_SECONDS by default.
+    max_attempts [int] - MAX_ATTEMPTS by default.
+    max_quarantines [int] - MAX_QUARANTINES by default.
+    """
+
+    # Jobs run by pool workers report to the local database writer instead of a coordinator.
+    remote = None
+
+    def __init__(self, database, name, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS,
+                 max_quarantines=MAX_QUARANTINES):
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.max_quarantines = max_quarantines
+        self.worker = socket.gethostname()
+        # Writes pause the database writer of this process (db_writer.paused) instead of waiting
+        # for its batch to commit, and wait out other processes' writes instead of failing. May be
+        # used from the threads of the coordinator, which take turns.
+        self._con = sqlite3.connect(database, timeout=60, isolation_level=None, check_same_thread=False)
+
+    def add(self, jobs):
+        """Adds pending jobs which aren't in the queue yet and returns the number added.
+
+        jobs [iterable] - (key, args) with a unique str key and a json serializable tuple of args."""
+        jobs = [(self.name, key, json.dumps(args)) for key, args in jobs]
+        with db_writer.paused():
+            cur = self._con.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            cur.executemany("INSERT OR IGNORE INTO jobs (queue, key, args) VALUES (?, ?, ?)", jobs)
+            added = cur.rowcount
+            cur.execute("COMMIT")
+        return added
+
+    def lease(self, n, worker=None):
+        """Leases up to n pending, expired or ready quarantined jobs and returns them as
+        (key, args) in the order they were added.
+
+        worker [str] - Name of the machine leasing the jobs. This machine by default."""
+        with db_writer.paused():
+            now = time.time()
+            cur = self._con.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            # Jobs which timed out too often are given up on.
+            cur.execute("""UPDATE jobs SET state = ?, error = 'lease expired'
+                WHERE queue = ? AND state = ? AND lease_until < ? AND attempts >= ?""",
+                        (FAILED, self.name, LEASED, now, self.max_attempts))
+            jobs = cur.execute("""SELECT key, args FROM jobs
+                WHERE queue = ? AND (state = ? OR (state IN (?, ?) AND lease_until < ?))
+                ORDER BY rowid LIMIT ?""", (self.name, PENDING, LEASED, QUARANTINED, now, n)).fetchall()
+            cur.executemany("""UPDATE jobs SET state = ?, attempts = attempts + 1, lease_until = ?, worker = ?
+                WHERE queue = ? AND key = ?""",
+                            ((LEASED, now + self.lease_seconds, worker or self.worker, self.name, key) for key, _ in jobs))
+            cur.execute("COMMIT")
+            return [(key, tuple(json.loads(args))) for key, args in jobs]
+
+    def fail(self, key, error):
+        """Returns a leased job to pending, or marks it failed after max_attempts leases."""
+        with db_writer.paused():
+            self._con.execute("""UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                lease_until = NULL, error = ? WHERE queue = ? AND key = ? AND state = ?""",
+                              (self.max_attempts, FAILED, PENDING, error, self.name, key, LEASED))
+
+    def quarantine(self, key, error, delay=QUARANTINE_SECONDS):
+        """Sets a leased job aside for delay seconds after its page was blocked, or marks it
+        failed once it was quarantined max_quarantines times so a page which is always blocked
+        isn't retried forever. The lease doesn't count towards max_attempts since the page
+        isn't at fault."""
+        with db_writer.paused():
+            self._con.execute("""UPDATE jobs SET state = CASE WHEN quarantines + 1 >= ? THEN ? ELSE ? END,
+                attempts = attempts - 1, quarantines = quarantines + 1, lease_until = ?, error = ?
+                WHERE queue = ? AND key = ? AND state = ?""",
+                              (self.max_quarantines, FAILED, QUARANTINED, time.time() + delay, error, self.name, key, LEASED))
+
+    def release_own(self, worker=None):
+        """Returns the jobs leased by this machine in an earlier run to pending, e.g. after a
+        crash, instead of waiting for their leases to expire.
+
+        worker [str] - Name of the machine. This machine by default."""
+        with db_writer.paused():
+            self._con.execute("UPDATE jobs SET state = ?, lease_until = NULL WHERE queue = ? AND state = ? AND worker = ?",
+                              (PENDING, self.name, LEASED, worker or self.worker))
+
+    def counts(self):
+        """Returns the number of jobs in each state."""
+        return dict(self._con.execute("SELECT state, COUNT(*) FROM jobs WHERE queue = ? GROUP BY state", (self.name,)))
+
+    def close(self):
+        self._con.close()
+
+
+def run_jobs(pool, job_queue, func, in_flight, fixed_args=(), refill=None, on_finish=None):
+    """Runs func(*fixed_args, *args) on pool for every job of job_queue until none are left.
+    Jobs are leased as workers free up so a slow job only holds up its own worker. Jobs
+    raising Blocked are quarantined so the worker moves on to the next job right away.
+
+    pool [multiprocessing.Pool] - Pool whose workers were started with db_writer.init_worker,
+    or a ThreadPool in the process of the writer.
+    job_queue [JobQueue] - Queue to run, or a coordinator.RemoteJobQueue on a worker node.
+    func [callable] - Module level function which does a job and sends its results to the writer.
+    in_flight [int] - Number of jobs leased and queued on the pool at a time.
+    fixed_args [tuple] - Arguments passed before the args of every job, e.g. locks.
+    refill [callable] - Called as refill(n) when fewer than n jobs could be leased, to add up to
+    n more jobs to job_queue, e.g. from the input file. Returns a false value once there is
+    nothing left to add.
+    on_finish [callable] - Called in this process as on_finish(key, error) after every job,
+    with error None if it succeeded."""
+    finished = queue.SimpleQueue()
+    running = set()
+    while True:
+        wanted = in_flight - len(running)
+        if wanted > 0:
+            jobs = job_queue.lease(wanted)
+            while len(jobs) < wanted and refill is not None:
+                if not refill(wanted - len(jobs)):
+                    refill = None
+                jobs += job_queue.lease(wanted - len(jobs))
+            for key, args in jobs:
+                running.add(key)
+                pool.apply_async(run_job, (func, job_queue.name, job_queue.remote, key, fixed_args, args),
+                                 callback=lambda _, key=key: finished.put((key, None)),
+                                 error_callback=lambda e, key=key: finished.put((key, e)))
+
+        if not running:
+            # Wait for jobs leased by other workers in case their leases expire, and for
+            # quarantined jobs to be ready.
+            counts = job_queue.counts()
+            if counts.get(LEASED) or counts.get(QUARANTINED):
+                time.sleep(POLL_SECONDS)
+                continue
+            break
+
+        key, error = finished.get()
+        running.discard(key)
+        if isinstance(error, Blocked):
+            logging.info(f"Quarantining job {key} - {error}")
+            job_queue.quarantine(key, repr(error))
+        elif error is not None:
+            logging.info(f"\nException in job {key} -\n {error!r}")
+            job_queue.fail(key, repr(error))
+        if on_finish is not None:
+            on_finish(key, error)
+
+
+def create_test_db(database):
+    con = sqlite3.connect(database)
+    create_jobs_table(con.cursor())
+    con.execute("CREATE TABLE IF NOT EXISTS test_results(key TEXT PRIMARY KEY)")
+    con.commit()
+    return con
+
+
+def write_test_result(cur, key):
+    cur.execute("INSERT INTO test_results VALUES (?)", (key,))
+
+
+def run_test_job(key, copies=1):
+    time.sleep(0.05)
+    for _ in range(copies):
+        db_writer.write(write_test_result, key)
+
+
+def test_run_jobs_throughput(n_jobs=200, processes=4):
+    # Leases must not wait for the batch of a running database writer to commit. Runs jobs
+    # which take 50ms and write a row, then checks every job is done with its row and logs the
+    # jobs per second and the slowest lease, which took up to db_writer.BATCH_SECONDS before.
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "test.db")
+        create_test_db(database).close()
+        jobs = JobQueue(database, "test")
+        jobs.add((str(i), (str(i),)) for i in range(n_jobs))
+
+        lease = jobs.lease
+        lease_seconds = []
+
+        def timed_lease(n):
+            start = time.time()
+            leased = lease(n)
+            lease_seconds.append(time.time() - start)
+            return leased
+
+        jobs.lease = timed_lease
+        writer = db_writer.DBWriter(create_test_db, database).start()
+        pool = multiprocessing.Pool(processes, initializer=db_writer.init_worker, initargs=(writer.queue,))
+        start = time.time()
+        run_jobs(pool, jobs, run_test_job, processes * 2)
+        seconds = time.time() - start
+        pool.close()
+        pool.join()
+        writer.close()
+
+        logging.info(f"{n_jobs} jobs in {seconds:.1f}s, {n_jobs / seconds:.1f} jobs/s, "
+                     f"slowest lease {max(lease_seconds):.3f}s")
+        assert jobs.counts() == {DONE: n_jobs}, jobs.counts()
+        con = sqlite3.connect(database)
+        assert con.execute("SELECT COUNT(*) FROM test_results").fetchone()[0] == n_jobs
+        con.close()
+        jobs.close()
+        assert max(lease_seconds) < 1, f"A lease took {max(lease_seconds):.1f}s"
+
+
+def test_failed_write():
+    # A job whose second write fails must have its first write rolled back and not be marked
+    # done, without losing the writes of the other job in the same batch.
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "test.db")
+        create_test_db(database).close()
+        jobs = JobQueue(database, "test")
+        jobs.add([("good", ("good",)), ("bad", ("bad", 2))])
+        with db_writer.DBWriter(create_test_db, database):
+            for key, args in jobs.lease(2):
+                run_job(run_test_job, jobs.name, None, key, (), args)
+
+        assert jobs.counts() == {DONE: 1, LEASED: 1}, jobs.counts()
+        con = sqlite3.connect(database)
+        assert con.execute("SELECT key FROM test_results").fetchall() == [("good",)]
+        con.close()
+        jobs.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO,
+                        datefmt='%m/%d/%Y %I:%M:%S %p')
+    test_run_jobs_throughput()
+    test_failed_write()
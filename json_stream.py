@@ -0,0 +1,129 @@
+import codecs
+import json
+import logging
+
+# Settings.
+
+# Bytes read from the file at a time. Reads grow with the buffer for records larger than this.
+BLOCK_SIZE = 1 << 20
+# Records larger than this many characters are treated as malformed so a broken file
+# can't be read into memory whole.
+MAX_RECORD_SIZE = 256 << 20
+
+
+# Script.
+
+# Accepts raw newlines inside strings like the old reader which stripped them before parsing.
+_decoder = json.JSONDecoder(strict=False)
+SEPARATORS = " \t\n\r,"
+
+
+def detect_format(path):
+    """Returns "array" for a json array of {"projects": [...]} objects, "lines" for one
+    {"data": {"projects": [...]}} object per line or None for anything else.
+
+    path [str] - Path to a Kickstarter json dump."""
+    with open(path, "rb") as f_obj:
+        while True:
+            char = f_obj.read(1)
+            if char in (b" ", b"\t", b"\n", b"\r"):
+                continue
+            return {b"[": "array", b"{": "lines"}.get(char)
+
+
+def iter_projects(path, statuses=None, start=None):
+    """Yields (position, project) for each project of a Kickstarter json dump, reading one
+    record (an element of the array or a line) at a time so memory is bounded by the largest
+    record instead of the file.
+
+    position is (offset, index), the byte offset of the record and the index in it of the next
+    project. Passing a position as start resumes right after its project by seeking to the
+    record instead of parsing the file from the start.
+
+    path [str] - Path to a Kickstarter json dump in either format of detect_format.
+    statuses [set] - Only projects with one of these states are yielded. All by default.
+    start [tuple] - position to resume from. The start of the file by default."""
+    file_format = detect_format(path)
+    if file_format == "array":
+        records = iter_array_records(path, start and start[0])
+    elif file_format == "lines":
+        records = iter_line_records(path, start and start[0])
+    else:
+        logging.error(f"Unknown JSON format in {path}")
+        return
+
+    skip = start[1] if start else 0
+    for offset, projects in records:
+        for index in range(skip, len(projects)):
+            project = projects[index]
+            if statuses is None or project.get("state") in statuses:
+                yield (offset, index + 1), project
+        skip = 0
+
+
+def iter_line_records(path, offset=None):
+    """Yields (offset, projects) for each line of a line delimited dump.
+
+    offset [int] - Byte offset of the line to start from. The start of the file by default."""
+    with open(path, "rb") as f_obj:
+        offset = offset or 0
+        f_obj.seek(offset)
+        for line in f_obj:
+            line_offset = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                json_obj = json.loads(line)
+            except json.JSONDecodeError as e:
+                logging.error(f"Error loading JSON object at byte {line_offset} of {path}: {e}")
+                continue
+            yield line_offset, json_obj.get("data", {}).get("projects", [])
+
+
+def iter_array_records(path, offset=None):
+    """Yields (offset, projects) for each element of an array dump.
+
+    offset [int] - Byte offset of the element to start from. The start of the file by default."""
+    decoder = codecs.getincrementaldecoder("utf8")()
+    with open(path, "rb") as f_obj:
+        if offset is None:
+            # Start after the opening bracket.
+            head = f_obj.read(BLOCK_SIZE)
+            offset = head.index(b"[") + 1
+        f_obj.seek(offset)
+
+        # offset is the byte offset of buffer[pos].
+        buffer = ""
+        pos = 0
+        eof = False
+        while True:
+            i = pos
+            while i < len(buffer) and buffer[i] in SEPARATORS:
+                i += 1
+            if i < len(buffer) and buffer[i] == "]":
+                return
+
+            error = None
+            if i < len(buffer):
+                try:
+                    json_obj, end = _decoder.raw_decode(buffer, i)
+                except json.JSONDecodeError as e:
+                    error = e
+                else:
+                    record_offset = offset + len(buffer[pos:i].encode("utf8"))
+                    offset = record_offset + len(buffer[i:end].encode("utf8"))
+                    pos = end
+                    yield record_offset, json_obj.get("projects", [])
+                    continue
+
+            # The record is cut off by the end of the buffer. Read at least as much again
+            # so a large record is parsed a bounded number of times.
+            if eof or len(buffer) - pos > MAX_RECORD_SIZE:
+                if error is not None:
+                    logging.error(f"Error loading JSON list at byte {offset} of {path}: {error}")
+                return
+            chunk = f_obj.read(max(BLOCK_SIZE, len(buffer) - pos))
+            eof = not chunk
+            buffer = buffer[pos:] + decoder.decode(chunk, final=eof)
+            pos = 0
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import time
+
+# Settings.
+
+# Bytes read at a time when hashing a file.
+HASH_CHUNK = 1 << 20
+
+
+# Script.
+
+def create_manifest_table(cur):
+    """Creates the manifest table if it doesn't exist.
+
+    cur [sqlite3.Cursor] - Cursor of the results database."""
+    cur.execute("""CREATE TABLE IF NOT EXISTS manifest(
+        path TEXT PRIMARY KEY,
+        size INTEGER,
+        mtime REAL,
+        hash TEXT,
+        version TEXT,
+        processed_at REAL
+        )""")
+
+
+def file_hash(path):
+    """Returns the blake2b hex digest of the contents of the file at path."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f_obj:
+        for chunk in iter(lambda: f_obj.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_state(path):
+    """Returns the (size, mtime, hash) of the file at path which Manifest.mark_done records, so
+    they can be taken in the pool worker which reads the file instead of the main process."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime, file_hash(path)
+
+
+class Manifest:
+    """
+    Input files already processed, e.g. zips or html files, with their size, modification time,
+    content hash and the version of the extractor which processed them. A file is current if it
+    was processed by this version and is unchanged. Its size and modification time are checked
+    first and its contents are only hashed if they changed, so a file which was only touched or
+    copied is still current.
+
+    con [sqlite3.Connection] - Connection to the database with the manifest table. Changes are
+    committed with the results written to it.
+    version [str] - Version of the extractor.
+    """
+
+    def __init__(self, con, version):
+        self.con = con
+        self.version = version
+
+    def is_current(self, path):
+        """Returns True if the file at path was processed by this version and hasn't changed since."""
+        row = self.con.execute("SELECT size, mtime, hash, version FROM manifest WHERE path = ?", (path,)).fetchone()
+        if row == None:
+            return False
+        size, mtime, hash_, version = row
+        if version != self.version:
+            return False
+        stat = os.stat(path)
+        if (stat.st_size, stat.st_mtime) == (size, mtime):
+            return True
+        if stat.st_size != size or file_hash(path) != hash_:
+            return False
+        self.con.execute("UPDATE manifest SET mtime = ? WHERE path = ?", (stat.st_mtime, path))
+        return True
+
+    def mark_done(self, path, state=None):
+        """Records the file at path as processed by this version.
+
+        state [tuple] - (size, mtime, hash) of the file from file_state. Taken now by default."""
+        size, mtime, hash_ = state or file_state(path)
+        self.con.execute("INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?, ?, ?)",
+                         (path, size, mtime, hash_, self.version, time.time()))
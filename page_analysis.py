@@ -0,0 +1,68 @@
+from collections import namedtuple
+
+from bs4 import BeautifulSoup
+
+import http_fetcher
+
+# Settings.
+
+# Parser used for the single parse of each page.
+PARSER = "lxml"
+
+
+# Script.
+
+# Kinds of pages.
+OK = "ok"
+CAPTCHA = "captcha"
+CHALLENGE = "challenge"
+HIDDEN = "hidden"
+DELETED = "deleted"
+NOT_FOUND = "404"
+
+# Kinds which are decided by a substring scan alone. These pages are never parsed.
+BLOCKED_MARKERS = {
+    CAPTCHA: http_fetcher.CAPTCHA_MARKERS,
+    CHALLENGE: http_fetcher.CHALLENGE_MARKERS,
+}
+# Substrings which must be in the page source before the selector of a kind is tried,
+# and the selector which confirms the kind once the page is parsed.
+MARKERS = {
+    HIDDEN: ('id="hidden_project"', 'div[id="hidden_project"]'),
+    DELETED: ('class="center"', 'div[class="center"]'),
+    NOT_FOUND: ('href="/?ref=404-ksr10"', 'a[href="/?ref=404-ksr10"]'),
+}
+
+# Kind of a page and its bs4 soup. soup is None for captcha and challenge pages.
+PageAnalysis = namedtuple("PageAnalysis", ["kind", "soup"])
+
+
+def blocked_kind(html):
+    """Returns CAPTCHA or CHALLENGE if html is a captcha or challenge page and None otherwise.
+    Only scans for substrings so it is cheap enough to call on every page source.
+
+    html [str] - Page source."""
+    for kind, markers in BLOCKED_MARKERS.items():
+        if any(marker in html for marker in markers):
+            return kind
+    return None
+
+
+def analyze_page(html, kinds=(HIDDEN, DELETED, NOT_FOUND)):
+    """Classifies a page source and returns a PageAnalysis. The page is parsed at most once
+    and not at all if it is a captcha or challenge page. Selectors of kinds are only tried
+    if their marker is in html.
+
+    html [str] - Page source.
+    kinds [tuple] - Kinds to check for besides CAPTCHA and CHALLENGE, in order. HIDDEN, DELETED
+    and NOT_FOUND by default."""
+    kind = blocked_kind(html)
+    if kind is not None:
+        return PageAnalysis(kind, None)
+
+    soup = BeautifulSoup(html, PARSER)
+    for kind in kinds:
+        marker, selector = MARKERS[kind]
+        if marker in html and soup.select_one(selector) is not None:
+            return PageAnalysis(kind, soup)
+    return PageAnalysis(OK, soup)
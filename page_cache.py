@@ -0,0 +1,121 @@
+import gzip
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+# Settings.
+
+# File names inside the cache folder.
+ARCHIVE_NAME = "pages.warc.gz"
+INDEX_NAME = "pages_index.db"
+
+
+# Script.
+
+class PageCache:
+    """
+    Append-only archive of fetched pages with a url -> offset index.
+
+    Every page is stored once as its own gzip member holding a WARC style record, so the
+    archive can be read with standard WARC tools. The index is a SQLite database which
+    maps (url, fetch time) to the offset and length of the record. Safe to share between
+    threads and processes since appends are serialized by the index's write lock.
+
+    path [str] - Folder to store the archive and index in. Created if it doesn't exist.
+    """
+
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._archive = open(os.path.join(path, ARCHIVE_NAME), "a+b")
+        self._index = sqlite3.connect(os.path.join(path, INDEX_NAME), isolation_level=None,
+                                      check_same_thread=False, timeout=60)
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("""CREATE TABLE IF NOT EXISTS pages(
+            url TEXT,
+            fetched_at REAL,
+            offset INTEGER,
+            length INTEGER
+            )""")
+        self._index.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages(url, fetched_at)")
+
+    def get(self, url, max_age=None):
+        """Returns the html of the latest copy of url or None if it isn't cached or is stale.
+
+        url [str] - Link of the page.
+        max_age [float] - Seconds after which a copy is stale. Never stale if None (default)."""
+        with self._lock:
+            row = self._index.execute(
+                "SELECT offset, length, fetched_at FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
+                (url,)).fetchone()
+            if row is None:
+                return None
+            offset, length, fetched_at = row
+            if max_age is not None and time.time() - fetched_at > max_age:
+                return None
+            self._archive.seek(offset)
+            record = gzip.decompress(self._archive.read(length))
+
+        body = record.split(b"\r\n\r\n", 1)[1][:-4]
+        return body.decode("utf8")
+
+    def put(self, url, html, fetched_at=None):
+        """Appends a copy of url to the archive and indexes it.
+
+        url [str] - Link of the page.
+        html [str] - Page source.
+        fetched_at [float] - Unix time the page was fetched. Now by default."""
+        if fetched_at is None:
+            fetched_at = time.time()
+        record = make_record(url, html, fetched_at)
+
+        with self._lock:
+            # Hold the index's write lock while appending so processes don't interleave records.
+            self._index.execute("BEGIN IMMEDIATE")
+            try:
+                self._archive.seek(0, os.SEEK_END)
+                offset = self._archive.tell()
+                self._archive.write(record)
+                self._archive.flush()
+                self._index.execute("INSERT INTO pages VALUES (?, ?, ?, ?)", (url, fetched_at, offset, len(record)))
+                self._index.execute("COMMIT")
+            except Exception:
+                self._index.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        with self._lock:
+            self._archive.close()
+            self._index.close()
+
+
+def make_record(url, html, fetched_at):
+    """Returns a gzip compressed WARC response record of html."""
+    body = html.encode("utf8")
+    date = datetime.fromtimestamp(fetched_at, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    header = (f"WARC/1.0\r\n"
+              f"WARC-Type: response\r\n"
+              f"WARC-Target-URI: {url}\r\n"
+              f"WARC-Date: {date}\r\n"
+              f"Content-Type: text/html; charset=utf-8\r\n"
+              f"Content-Length: {len(body)}\r\n\r\n")
+    return gzip.compress(header.encode("utf8") + body + b"\r\n\r\n")
+
+
+# Caches of the current process keyed by path.
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_page_cache(path):
+    """Returns the current process's PageCache for path, opening it on first use.
+
+    path [str] - Folder of the cache."""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = PageCache(path)
+    return cache
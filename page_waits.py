@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import WebDriverException
+
+# Settings.
+
+# Element whose presence means the data of each page type is loaded. Pages without one
+# only wait for the DOM and network to go quiet.
+TARGETS = {
+    # Created and backed counts in the creator modal opened by clicking "About the creator".
+    "campaign": '[class="created-projects py2 f5 mb3"]',
+    "about": 'meta[property="og:url"]',
+    "created": 'div[data-projects]',
+    # Marker of the last page of the infinite scroll of backed projects.
+    "backed": 'li[data-last_page="true"]',
+}
+# Mean seconds of the fixed sleep each page type waited before, to report the time saved.
+FIXED_SLEEPS = {"campaign": 5, "about": 1, "created": 1, "backed": 1.5}
+# Milliseconds without DOM changes or network requests after which a page is idle.
+QUIET_MS = 500
+# Seconds to wait at most.
+TIMEOUT = 15
+# Log stats every LOG_EVERY waits.
+LOG_EVERY = 100
+
+
+# Script.
+
+# Results of a wait.
+FOUND = "found"
+IDLE = "idle"
+TIMEOUT_REACHED = "timeout"
+
+# Resolves once the target is in the page, or once neither a DOM mutation nor a request
+# happened for quiet ms with no request in flight. fetch and XMLHttpRequest are wrapped
+# once per page to count requests in flight, before scrolling so the requests the scroll
+# starts are counted too.
+WAIT_SCRIPT = """
+var selector = arguments[0], quiet = arguments[1], timeout = arguments[2], scroll = arguments[3];
+var done = arguments[arguments.length - 1];
+if (!window.__pageWaits) {
+    var state = window.__pageWaits = {pending: 0, last: Date.now()};
+    var settle = function () { state.pending = Math.max(0, state.pending - 1); state.last = Date.now(); };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++; state.last = Date.now();
+        this.addEventListener("loadend", settle);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            state.pending++; state.last = Date.now();
+            return fetch.apply(this, arguments).finally(settle);
+        };
+    }
+}
+var state = window.__pageWaits, start = Date.now(), finished = false, timer = null;
+state.last = start;
+var observer = new MutationObserver(function () { state.last = Date.now(); });
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(timer);
+    done(result);
+}
+function check() {
+    if (selector && document.querySelector(selector)) return finish("found");
+    var now = Date.now();
+    if (document.readyState === "complete" && state.pending === 0 && now - state.last >= quiet) return finish("idle");
+    if (now - start >= timeout) finish("timeout");
+}
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+if (scroll) window.scrollTo(0, document.body.scrollHeight);
+timer = setInterval(check, 50);
+check();
+"""
+
+stats = defaultdict(lambda: {"waits": 0, "waited": 0.0, "saved": 0.0})
+_stats_lock = threading.Lock()
+
+
+def wait(driver, page, scroll=False, timeout=TIMEOUT):
+    """Waits until the target of page is in the page of driver, or until the page is idle
+    if it has no target or the target doesn't show up first. Returns FOUND, IDLE or
+    TIMEOUT_REACHED. The time taken is counted against the fixed sleep of the page type.
+
+    driver [selenium webdriver] - A webdriver with a page loaded.
+    page [str] - Page type, a key of TARGETS, e.g. "campaign". Other types only wait for idle.
+    scroll [bool] - True to scroll to the bottom first, e.g. to load the next page of an
+    infinite scroll. False by default.
+    timeout [float] - Seconds to wait at most. TIMEOUT by default."""
+    start = time.time()
+    try:
+        driver.set_script_timeout(timeout + 5)
+        result = driver.execute_async_script(WAIT_SCRIPT, TARGETS.get(page), QUIET_MS, timeout * 1000, scroll)
+    except WebDriverException as e:
+        logging.info(f"Error waiting for {page} page: {e!r}")
+        result = TIMEOUT_REACHED
+    count(page, time.time() - start)
+    return result
+
+
+def count(page, waited):
+    """Adds a wait of page to the stats and logs them every LOG_EVERY waits."""
+    with _stats_lock:
+        page_stats = stats[page]
+        page_stats["waits"] += 1
+        page_stats["waited"] += waited
+        page_stats["saved"] += FIXED_SLEEPS.get(page, 0) - waited
+        total = sum(page_stats["waits"] for page_stats in stats.values())
+    if total % LOG_EVERY == 0:
+        log_stats()
+
+
+def log_stats():
+    """Logs the mean wait and time saved against the fixed sleeps of each page type."""
+    with _stats_lock:
+        for page, page_stats in stats.items():
+            waits = page_stats["waits"]
+            logging.info(f"Waits for {page} pages: {waits}, mean {page_stats['waited'] / waits:.2f}s, "
+                         f"saved {page_stats['saved']:.0f}s ({page_stats['saved'] / waits:.2f}s per wait)")
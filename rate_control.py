@@ -0,0 +1,236 @@
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Settings.
+
+# Requests per second a process starts at and the bounds the controller keeps it in.
+START_RATE = 0.5
+MIN_RATE = 0.05
+MAX_RATE = 4.0
+# Requests per second added after every WINDOW requests with few enough blocks.
+INCREASE_STEP = 0.05
+# Factor the rate is multiplied by when the block rate is too high.
+DECREASE_FACTOR = 0.5
+# Number of latest requests the block rate is taken over.
+WINDOW = 20
+# Share of blocked requests in the window above which the rate is decreased.
+MAX_BLOCK_RATE = 0.05
+# Number of blocks in a row after which the egress (vpn server, proxy or browser) should be
+# changed. It is also changed when the block rate is still too high at MIN_RATE.
+ROTATE_AFTER = 2
+# Share of the interval between requests added or taken at random so they aren't evenly spaced.
+JITTER = 0.25
+# File every decision is appended to as a json line. None to only log them.
+METRICS_PATH = "rate_metrics.jsonl"
+# Seconds after a change of egress during which every process on this machine skips the
+# changes it decides on, since they share the vpn connection.
+ROTATE_COOLDOWN = 60
+# File locked while a process changes egress, holding the time of the last change. Shared by
+# every script on this machine.
+ROTATE_LOCK_PATH = os.path.join(tempfile.gettempdir(), "rate_control_rotate.lock")
+
+
+# Script.
+
+OK = "ok"
+# Outcomes which mean we are blocked or rate limited. Named like the reasons of http_fetcher.needs_browser.
+BLOCKED = {"captcha", "challenge", "status_403", "status_429", "status_503"}
+
+# Decisions.
+INCREASE = "increase"
+DECREASE = "decrease"
+ROTATE = "rotate"
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+class RateController:
+    """
+    Additive increase, multiplicative decrease pacing of the requests of a process. The rate
+    goes up by a small step after every window of requests with few blocks and is cut by a
+    factor as soon as the block rate of the latest requests rises, so it settles just below
+    the rate the site starts blocking at instead of a fixed sleep that is either too slow or
+    too fast. When blocks keep coming at the lowest rate it decides the egress has to change.
+
+    start_rate [float] - Requests per second to start at. START_RATE by default.
+    min_rate [float] - MIN_RATE by default.
+    max_rate [float] - MAX_RATE by default.
+    metrics_path [str] - File decisions are appended to. METRICS_PATH by default.
+    """
+
+    def __init__(self, start_rate=START_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE, metrics_path=METRICS_PATH):
+        self.rate = start_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.metrics_path = metrics_path
+        # Called with no arguments when the controller decides to rotate, e.g. to change vpn server.
+        # Only one process of the machine calls it at a time and at most once every ROTATE_COOLDOWN.
+        self.on_rotate = None
+        self.counts = Counter()
+        self._window = deque(maxlen=WINDOW)
+        # Requests since the rate last changed and blocks in a row.
+        self._since_change = 0
+        self._blocks_in_row = 0
+        self._next_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Sleeps until the next request may start. Requests of every thread of the process
+        are spaced 1 / rate apart, give or take JITTER."""
+        delay = self.delay()
+        if delay > 0:
+            time.sleep(delay)
+
+    def delay(self):
+        """Reserves the start of the next request and returns the seconds to wait for it,
+        for callers which sleep themselves, e.g. in an event loop."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + random.uniform(1 - JITTER, 1 + JITTER) / self.rate
+        return start - now
+
+    def block_rate(self):
+        """Returns the share of blocked requests in the window."""
+        with self._lock:
+            return sum(self._window) / len(self._window) if self._window else 0.0
+
+    def record(self, outcome):
+        """Counts the outcome of a request and adjusts the rate. Returns the decision made,
+        INCREASE, DECREASE or ROTATE, or None if the rate was kept.
+
+        outcome [str] - OK, a reason in BLOCKED or any other reason, e.g. "missing_json",
+        which is counted but neither raises nor lowers the rate."""
+        blocked = outcome in BLOCKED
+        decision = None
+        with self._lock:
+            self.counts[outcome] += 1
+            if outcome != OK and not blocked:
+                return None
+
+            self._window.append(blocked)
+            self._since_change += 1
+            block_rate = sum(self._window) / len(self._window)
+            if blocked:
+                self._blocks_in_row += 1
+                if self._blocks_in_row >= ROTATE_AFTER or (block_rate > MAX_BLOCK_RATE and self.rate <= self.min_rate):
+                    decision = ROTATE
+                elif block_rate > MAX_BLOCK_RATE:
+                    decision = DECREASE
+                if decision is not None:
+                    self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+                    self._since_change = 0
+                if decision == ROTATE:
+                    # Start over on the new egress.
+                    self._blocks_in_row = 0
+                    self._window.clear()
+            else:
+                self._blocks_in_row = 0
+                if self._since_change >= WINDOW and block_rate <= MAX_BLOCK_RATE and self.rate < self.max_rate:
+                    decision = INCREASE
+                    self.rate = min(self.max_rate, self.rate + INCREASE_STEP)
+                    self._since_change = 0
+            if decision is not None:
+                self.counts[decision] += 1
+            rate = self.rate
+
+        if decision is not None:
+            self._log_decision(decision, outcome, rate, block_rate)
+            if decision == ROTATE and self.on_rotate is not None:
+                rotate_once(self.on_rotate)
+        return decision
+
+    def _log_decision(self, decision, outcome, rate, block_rate):
+        if decision != INCREASE:
+            logging.info(f"Rate control: {decision} to {rate:.3f} requests/s after {outcome} (block rate {block_rate:.0%}).")
+        if self.metrics_path is None:
+            return
+        line = json.dumps({"time": time.time(), "pid": os.getpid(), "decision": decision, "outcome": outcome,
+                           "rate": round(rate, 4), "block_rate": round(block_rate, 4)})
+        try:
+            with open(self.metrics_path, "a") as f_obj:
+                f_obj.write(line + "\n")
+        except OSError as e:
+            logging.info(f"Error writing rate metrics: {e}")
+
+    def metrics(self):
+        """Returns the current rate, block rate and the number of each outcome and decision."""
+        with self._lock:
+            block_rate = sum(self._window) / len(self._window) if self._window else 0.0
+            return {"rate": self.rate, "block_rate": block_rate, **self.counts}
+
+    def log_stats(self):
+        """Logs the current rate, block rate and counts."""
+        metrics = self.metrics()
+        rate, block_rate = metrics.pop("rate"), metrics.pop("block_rate")
+        logging.info(f"Rate: {rate:.3f} requests/s, block rate: {block_rate:.0%} {metrics}")
+
+
+def get_rate_controller():
+    """Returns the current process's RateController, creating it on first use. Each worker
+    process paces its own browser and egress."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = RateController()
+    return _controller
+
+
+def rotate_once(rotate, cooldown=ROTATE_COOLDOWN, lock_path=ROTATE_LOCK_PATH):
+    """Calls rotate unless another process on this machine is changing egress or changed it
+    less than cooldown seconds ago, so pool workers which are blocked at the same time change
+    the vpn server once between them. Returns True if rotate was called.
+
+    rotate [callable] - Changes egress, e.g. clicks the vpn to another server.
+    cooldown [float] - ROTATE_COOLDOWN by default.
+    lock_path [str] - ROTATE_LOCK_PATH by default."""
+    with open(lock_path, "a+") as f_obj:
+        try:
+            _lock(f_obj)
+        except OSError:
+            logging.info("Rate control: skipping rotation, another process is rotating.")
+            return False
+        try:
+            f_obj.seek(0)
+            last = f_obj.read().strip()
+            if last and time.time() - float(last) < cooldown:
+                logging.info("Rate control: skipping rotation, egress was changed recently.")
+                return False
+            rotate()
+            # The cooldown starts once the new egress is up.
+            f_obj.seek(0)
+            f_obj.truncate()
+            f_obj.write(str(time.time()))
+            f_obj.flush()
+            return True
+        finally:
+            _unlock(f_obj)
+
+
+def _lock(f_obj):
+    """Locks f_obj for this process without waiting. Raises OSError if another process holds it."""
+    if os.name == "nt":
+        f_obj.seek(0)
+        msvcrt.locking(f_obj.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(f_obj, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock(f_obj):
+    if os.name == "nt":
+        f_obj.seek(0)
+        msvcrt.locking(f_obj.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f_obj, fcntl.LOCK_UN)
@@ -0,0 +1,57 @@
+import logging
+
+from selenium.common.exceptions import WebDriverException
+
+# Settings.
+
+# Set to False to let drivers load every resource of a page again.
+BLOCK_RESOURCES = True
+# File extensions of media which is counted with selectors but never looked at.
+MEDIA_EXTENSIONS = ["jpg", "jpeg", "png", "gif", "webp", "svg", "ico", "mp4", "webm", "m3u8", "mp3",
+                    "woff", "woff2", "ttf", "otf", "eot"]
+# Url patterns of media. Chrome finds the parts between "*" in order anywhere in the url and
+# can't require it to end with an extension, so "*.ico*" also matched ".icons.js". Extensions
+# only match followed by a query string, and media without one is blocked by kickstarter's
+# media hosts.
+BLOCKED_MEDIA = [f"*.{extension}?*" for extension in MEDIA_EXTENSIONS] + [
+    "*://i.kickstarter.com/*", "*://ksr-ugc.imgix.net/*", "*://ksr-video.imgix.net/*", "*://v.kickstarter.com/*"]
+# Url patterns of third-party resources the scraped data doesn't depend on. Don't add
+# cdn.embedly.com, whose script adds the embedly-card-hug elements embedded videos are
+# counted by, or the hosts of captchas and challenges, which couldn't be solved anymore.
+BLOCKED_THIRD_PARTY = ["*://www.google-analytics.com/*", "*://www.googletagmanager.com/*",
+                       "*://*.doubleclick.net/*", "*://connect.facebook.net/*", "*://www.facebook.com/tr*",
+                       "*://cdn.segment.com/*", "*://api.segment.io/*", "*://*.hotjar.com/*",
+                       "*://*.sentry.io/*", "*://*.newrelic.com/*", "*://*.nr-data.net/*",
+                       "*://fonts.googleapis.com/*", "*://fonts.gstatic.com/*",
+                       # Players of embedded videos. Their iframes stay in the page.
+                       "*://www.youtube.com/embed/*", "*://player.vimeo.com/*", "*://*.ytimg.com/*"]
+
+
+# Script.
+
+def block_resources(driver, patterns=None):
+    """Stops driver from loading media and third-party resources through the chrome devtools
+    protocol. Only the requests are blocked, so the elements of the page, e.g. img and video
+    tags, stay where they are. Does nothing if BLOCK_RESOURCES is False. Returns driver.
+
+    driver [selenium webdriver] - A chrome webdriver, e.g. undetected chrome or seleniumbase.
+    patterns [list] - Url patterns to block. BLOCKED_MEDIA and BLOCKED_THIRD_PARTY by default."""
+    if not BLOCK_RESOURCES:
+        return driver
+    if patterns is None:
+        patterns = BLOCKED_MEDIA + BLOCKED_THIRD_PARTY
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except WebDriverException as e:
+        # The driver still works, it just loads everything.
+        logging.info(f"Could not block resources: {e!r}")
+    return driver
+
+
+def transferred_bytes(driver):
+    """Returns the bytes transferred for the resources of the current page of driver, as far as
+    the browser's resource timing reports them."""
+    return driver.execute_script(
+        "return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))"
+        ".reduce((total, entry) => total + (entry.transferSize || 0), 0);")
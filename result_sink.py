@@ -0,0 +1,97 @@
+import pickle
+import sqlite3
+
+from manifest import create_manifest_table
+
+# Settings.
+
+# Number of results written between commits. Results since the last commit are lost on a crash.
+COMMIT_EVERY = 500
+
+
+# Script.
+
+class ResultSink:
+    """
+    Results of the offline extractor written to a SQLite file as the pool yields them instead
+    of being kept in memory until the end. Results are committed every COMMIT_EVERY results so
+    a crash keeps everything but the last few, and export streams them back out one at a time.
+    Every result is stored with its source, the zip or file it came from, so the results of a
+    source can be replaced when it is processed again. The database also holds the manifest of
+    processed sources, committed together with their results.
+
+    path [str] - Path to the results database. Created if it doesn't exist.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.con = sqlite3.connect(path)
+        self.con.execute("CREATE TABLE IF NOT EXISTS campaigns (id INTEGER PRIMARY KEY, source TEXT, data BLOB)")
+        self.con.execute("CREATE INDEX IF NOT EXISTS campaigns_source ON campaigns(source)")
+        self.con.execute("""CREATE TABLE IF NOT EXISTS updates (source TEXT, url TEXT, day, month, year,
+            PRIMARY KEY (source, url))""")
+        self.con.execute("CREATE TABLE IF NOT EXISTS columns (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+        create_manifest_table(self.con.cursor())
+        self.columns = {name: None for name, in self.con.execute("SELECT name FROM columns ORDER BY id")}
+        self._uncommitted = 0
+
+    def remove(self, source):
+        """Deletes the results of source, e.g. before it is processed again."""
+        self.con.execute("DELETE FROM campaigns WHERE source = ?", (source,))
+        self.con.execute("DELETE FROM updates WHERE source = ?", (source,))
+
+    def add_campaign(self, source, datum):
+        """Writes the data dict of a campaign file. Values are pickled so they come back as they
+        were, e.g. lists of tuples."""
+        self.con.execute("INSERT INTO campaigns (source, data) VALUES (?, ?)", (source, pickle.dumps(datum)))
+        # Columns in the order they are first seen, like a DataFrame of the dicts.
+        new = [key for key in datum if key not in self.columns]
+        if new:
+            self.columns.update(dict.fromkeys(new))
+            self.con.executemany("INSERT OR IGNORE INTO columns (name) VALUES (?)", ((key,) for key in new))
+        self._written()
+
+    def add_update(self, source, url, date, missing):
+        """Writes the start date of url found in its update files. A date equal to missing
+        doesn't replace a date already found, since update files of a project may come in more
+        than one group.
+
+        source [str] - Zip or folder of the update files.
+        url [str] - Url of the project.
+        date [tuple] - (day, month, year).
+        missing [tuple] - Date of a project whose start date wasn't found."""
+        if tuple(date) == tuple(missing):
+            self.con.execute("INSERT OR IGNORE INTO updates VALUES (?, ?, ?, ?, ?)", (source, url, *date))
+        else:
+            self.con.execute("INSERT OR REPLACE INTO updates VALUES (?, ?, ?, ?, ?)", (source, url, *date))
+        self._written()
+
+    def _written(self):
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_EVERY:
+            self.commit()
+
+    def commit(self):
+        self.con.commit()
+        self._uncommitted = 0
+
+    def get_update_data(self, missing):
+        """Returns a dict of url to (day, month, year) of every update written. A date found in
+        any source wins over missing.
+
+        missing [tuple] - Date of a project whose start date wasn't found."""
+        update_data = {}
+        for url, day, month, year in self.con.execute("SELECT url, day, month, year FROM updates"):
+            if url not in update_data or (day, month, year) != tuple(missing):
+                update_data[url] = (day, month, year)
+        return update_data
+
+    def iter_campaigns(self):
+        """Yields the data dicts of the campaigns in the order they were written."""
+        for data, in self.con.execute("SELECT data FROM campaigns ORDER BY id"):
+            yield pickle.loads(data)
+
+    def close(self):
+        self.commit()
+        self.con.close()
+
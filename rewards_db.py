@@ -0,0 +1,87 @@
+import re
+
+# Settings.
+
+# Fields of a reward in the order of the old rd_*_{i} columns.
+REWARD_FIELDS = ["rd_id", "rd_title", "rd_price", "rd_desc", "rd_list", "rd_delivery_date",
+                 "rd_shipping_location", "rd_backers", "rd_limit", "rd_gone"]
+
+# Name of the wide view created by create_wide_view.
+WIDE_VIEW = "projects_wide"
+
+
+# Script.
+
+# Columns of the old wide projects table, e.g. rd_title_12.
+WIDE_COLUMN_RE = re.compile(r"^(%s)_(\d+)$" % "|".join(REWARD_FIELDS))
+
+
+def create_rewards_table(cur):
+    """Creates the rewards table if it doesn't exist. Each reward is one row keyed by the
+    link of its project (the UNIQUE key of projects) and its index on the rewards page.
+
+    cur [sqlite3.Cursor] - Cursor of the projects database."""
+    cur.execute(f"""CREATE TABLE IF NOT EXISTS rewards(
+        rd_project_link TEXT,
+        idx INTEGER,
+        {", ".join(f"{field} TEXT" for field in REWARD_FIELDS)},
+        PRIMARY KEY (rd_project_link, idx)
+        )""")
+    cur.execute("CREATE INDEX IF NOT EXISTS rewards_rd_id ON rewards(rd_id)")
+
+
+def insert_rewards(cur, project_link, rewards):
+    """Inserts the rewards of a project with a single executemany.
+
+    cur [sqlite3.Cursor] - Cursor of the projects database.
+    project_link [str] - rd_project_link of the project.
+    rewards [list] - Dicts from get_pledge_data in page order."""
+    columns = ", ".join(["rd_project_link", "idx"] + REWARD_FIELDS)
+    placeholders = ", ".join("?" * (len(REWARD_FIELDS) + 2))
+    cur.executemany(f"INSERT OR IGNORE INTO rewards ({columns}) VALUES ({placeholders})",
+                    [(project_link, idx, *(reward.get(field) for field in REWARD_FIELDS))
+                     for idx, reward in enumerate(rewards)])
+
+
+def to_wide(rewards):
+    """Returns rewards as a single dict with the old rd_*_{i} keys, e.g. for test csvs.
+
+    rewards [list] - Dicts from get_pledge_data in page order."""
+    return {f"{field}_{idx}": reward.get(field) for idx, reward in enumerate(rewards) for field in REWARD_FIELDS}
+
+
+def create_wide_view(con, table="projects", name=WIDE_VIEW):
+    """Creates a temporary view of table with one column per reward field like the old wide
+    projects table, so old csv exports keep their layout. Rewards are taken from the rewards
+    table and, for databases made before it existed, from the old rd_*_{i} columns of table.
+
+    con [sqlite3.Connection] - Connection to the projects database.
+    table [str] - Table to widen. "projects" by default.
+    name [str] - Name of the view. WIDE_VIEW by default."""
+    cur = con.cursor()
+    create_rewards_table(cur)
+    columns = [row[1] for row in cur.execute(f"PRAGMA table_info({table})")]
+    wide_columns = {column for column in columns if WIDE_COLUMN_RE.match(column)}
+    base_columns = [column for column in columns if column not in wide_columns]
+
+    # Number of reward slots needed by the widest project.
+    max_idx = cur.execute("SELECT MAX(idx) FROM rewards").fetchone()[0]
+    old_max_idx = max((int(WIDE_COLUMN_RE.match(column).group(2)) for column in wide_columns), default=-1)
+    num_rewards = max(-1 if max_idx is None else max_idx, old_max_idx) + 1
+
+    selects = [f'p."{column}"' for column in base_columns]
+    for idx in range(num_rewards):
+        for field in REWARD_FIELDS:
+            column = f"{field}_{idx}"
+            pivot = f"MAX(CASE WHEN r.idx = {idx} THEN r.{field} END)"
+            if column in wide_columns:
+                pivot = f'COALESCE({pivot}, p."{column}")'
+            selects.append(f'{pivot} AS "{column}"')
+
+    cur.execute(f"DROP VIEW IF EXISTS temp.{name}")
+    cur.execute(f"""CREATE TEMP VIEW {name} AS
+        SELECT {", ".join(selects)}
+        FROM {table} p LEFT JOIN rewards r ON r.rd_project_link = p.rd_project_link
+        GROUP BY p.rowid
+        ORDER BY p.rowid""")
+    cur.close()
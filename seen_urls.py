@@ -0,0 +1,112 @@
+import hashlib
+import math
+import sqlite3
+
+# Settings.
+
+# Set to True to keep a Bloom filter in memory instead of every url. Urls the filter
+# may have seen are confirmed with an indexed lookup in the urls table.
+BLOOM = False
+# Expected number of urls and false positive rate the Bloom filter is sized for.
+BLOOM_CAPACITY = 10_000_000
+BLOOM_ERROR_RATE = 0.001
+
+# Tables whose urls are seen and the column holding the url.
+URL_SOURCES = {
+    "projects": "rd_project_link",
+    "ignored_projects": "rd_project_link",
+    "hidden_projects": "url",
+}
+
+
+# Script.
+
+def create_urls_table(cur):
+    """Creates the urls table of every url in URL_SOURCES if it doesn't exist and the triggers
+    which keep it up to date as projects are written. Existing urls are copied in once when the
+    table is created. Must be called after the tables in URL_SOURCES are created.
+
+    cur [sqlite3.Cursor] - Cursor of the projects database."""
+    exists = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'urls'").fetchone()
+    cur.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    tables = {row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table, column in URL_SOURCES.items():
+        if table not in tables:
+            continue
+        cur.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_seen AFTER INSERT ON {table}
+            WHEN NEW.{column} IS NOT NULL
+            BEGIN INSERT OR IGNORE INTO urls VALUES (NEW.{column}); END""")
+        if not exists:
+            cur.execute(f"INSERT OR IGNORE INTO urls SELECT {column} FROM {table} WHERE {column} IS NOT NULL")
+
+
+class BloomFilter:
+    """
+    Fixed size Bloom filter of strings. May say a string was added when it wasn't
+    (at about error_rate) but never the other way around.
+
+    capacity [int] - Expected number of strings.
+    error_rate [float] - False positive rate at capacity.
+    """
+
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, string):
+        # Double hashing with two 64 bit halves of one digest.
+        digest = hashlib.blake2b(string.encode("utf8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.num_hashes))
+
+    def add(self, string):
+        for pos in self._positions(string):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, string):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(string))
+
+
+class SeenSet:
+    """
+    Urls which are already scraped, ignored or hidden, loaded once from the urls table.
+    Urls handed out for scraping are added with add so they aren't handed out again
+    before the database writer commits them.
+
+    database [str] - Path to the projects database. The urls table must exist.
+    bloom [bool] - True to keep a Bloom filter instead of a set. BLOOM by default.
+    """
+
+    def __init__(self, database, bloom=BLOOM):
+        self.database = database
+        self.bloom = bloom
+        self._con = sqlite3.connect(database, check_same_thread=False)
+        self.reload()
+
+    def reload(self):
+        """Reloads the urls from the database, dropping added urls which weren't written,
+        e.g. after a failed chunk."""
+        self._urls = BloomFilter() if self.bloom else set()
+        # Urls added in this run. Only kept apart from _urls with the Bloom filter.
+        self._added = set()
+        for (url,) in self._con.execute("SELECT url FROM urls"):
+            self._urls.add(url)
+
+    def add(self, url):
+        self._urls.add(url)
+        if self.bloom:
+            self._added.add(url)
+
+    def __contains__(self, url):
+        if url not in self._urls:
+            return False
+        if not self.bloom:
+            return True
+        # Rule out a false positive of the filter.
+        return url in self._added or self._con.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def close(self):
+        self._con.close()
@@ -0,0 +1,79 @@
+import io
+import logging
+import os
+import zipfile
+from collections import namedtuple
+
+
+# Script.
+
+class ZipMember(namedtuple("ZipMember", ["path", "data"])):
+    """
+    A file read from a zip into memory. Small enough to be sent to pool workers.
+
+    path [str] - Path the file would have if the zip and its nested zips were extracted,
+    e.g. for the date and time in the file name.
+    data [bytes] - Contents of the file.
+    """
+
+    __slots__ = ()
+
+    def read(self):
+        """Returns the contents as text, like opening the extracted file would."""
+        return self.data.decode("utf8", errors="backslashreplace")
+
+
+class NestedZip(namedtuple("NestedZip", ["path", "data"])):
+    """
+    A zip inside another zip, read into memory but not opened, so the files in it can be
+    decompressed by a pool worker instead of the process reading the outer zip.
+
+    path [str] - Path the nested zip would have if the outer zip was extracted.
+    data [bytes] - Contents of the nested zip.
+    """
+
+    __slots__ = ()
+
+    def members(self, suffixes=(".html",)):
+        """Yields a ZipMember for every file in the nested zip, and zips nested in it, whose
+        name ends with one of suffixes. Files are extracted next to where the nested zip is,
+        like the nested zips were extracted before. Yields nothing if it isn't a valid zip."""
+        try:
+            nested = zipfile.ZipFile(io.BytesIO(self.data))
+        except zipfile.BadZipFile:
+            logging.info(f"Skipping bad zip {self.path}")
+            return
+        with nested:
+            yield from _iter_zip(nested, suffixes, os.path.dirname(self.path), True)
+
+
+def iter_members(zip_file, suffixes=(".html",), base=None, expand_nested=True):
+    """Yields a ZipMember for every file in zip_file and its nested zips whose name ends with
+    one of suffixes, read one at a time. Nested zips are opened in memory as if extracted next
+    to where they are in the outer zip, so nothing but the zip being read is touched on disk.
+    Nested zips which are not valid zips are skipped.
+
+    zip_file [str] - Path to the zip.
+    suffixes [tuple] - Endings of the names of the files to read. (".html",) by default.
+    base [str] - Path the zip would be extracted to. zip_file without ".zip" by default.
+    expand_nested [bool] - False to yield nested zips as NestedZip instead of the files in
+    them, e.g. to decompress them in pool workers. True by default."""
+    if base is None:
+        base = zip_file[:-4]
+    with zipfile.ZipFile(zip_file) as zip_ref:
+        yield from _iter_zip(zip_ref, suffixes, base, expand_nested)
+
+
+def _iter_zip(zip_ref, suffixes, base, expand_nested):
+    for info in zip_ref.infolist():
+        if info.is_dir():
+            continue
+        path = os.path.join(base, *info.filename.split("/"))
+        if info.filename.endswith(".zip"):
+            nested = NestedZip(path, zip_ref.read(info))
+            if expand_nested:
+                yield from nested.members(suffixes)
+            else:
+                yield nested
+        elif info.filename.endswith(suffixes):
+            yield ZipMember(path, zip_ref.read(info))